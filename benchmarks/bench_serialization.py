@@ -0,0 +1,123 @@
+"""Benchmark event serialization for the events endpoint.
+
+Compares the original per-event loop encoded with the stdlib json module
+against the current full and compact serializers encoded with orjson.
+
+Usage: python benchmarks/bench_serialization.py [number_of_events]
+"""
+import importlib.util
+import json
+import os
+import sys
+import timeit
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+
+import orjson
+
+SERIALIZATION_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)),
+    "..",
+    "custom_components",
+    "family_calendar",
+    "serialization.py",
+)
+
+# Load the module directly so Home Assistant does not need to be installed
+_spec = importlib.util.spec_from_file_location("serialization", SERIALIZATION_PATH)
+serialization = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(serialization)
+
+
+@dataclass
+class CalendarEvent:
+    """Stand-in for homeassistant.components.calendar.CalendarEvent."""
+
+    start: object
+    end: object
+    summary: str
+    description: str = None
+    location: str = None
+    uid: str = None
+    recurrence_id: str = None
+    rrule: str = None
+
+
+def make_events(count):
+    """Build a realistic mix of timed and all-day events."""
+    tz = timezone(timedelta(hours=1))
+    base = datetime(2025, 1, 6, 8, 0, tzinfo=tz)
+    events = []
+    for i in range(count):
+        if i % 5 == 0:
+            start = date(2025, 1, 6) + timedelta(days=i % 60)
+            end = start + timedelta(days=1)
+        else:
+            start = base + timedelta(hours=i % 500)
+            end = start + timedelta(minutes=45)
+        events.append(
+            CalendarEvent(
+                start=start,
+                end=end,
+                summary=f"Event {i}",
+                description="Bring the gym bag" if i % 3 == 0 else None,
+                location="School" if i % 4 == 0 else None,
+                uid=f"uid-{i}@family-calendar",
+            )
+        )
+    return events
+
+
+def serialize_events_original(events):
+    """The serialization loop as it was in FamilyCalendarEventsView.get."""
+    events_list = []
+    for event in events:
+        event_dict = {
+            "summary": event.summary,
+            "start": {},
+            "end": {},
+        }
+
+        if not hasattr(event.start, 'hour'):
+            event_dict["start"]["date"] = event.start.strftime("%Y-%m-%d")
+            event_dict["end"]["date"] = event.end.strftime("%Y-%m-%d")
+        else:
+            event_dict["start"]["dateTime"] = event.start.isoformat()
+            event_dict["end"]["dateTime"] = event.end.isoformat()
+
+        if hasattr(event, 'description') and event.description:
+            event_dict["description"] = event.description
+        if hasattr(event, 'location') and event.location:
+            event_dict["location"] = event.location
+        if hasattr(event, 'uid') and event.uid:
+            event_dict["uid"] = event.uid
+
+        events_list.append(event_dict)
+    return events_list
+
+
+def main():
+    """Run the benchmark and print a comparison table."""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    events = make_events(count)
+
+    cases = {
+        "original + json": lambda: json.dumps(serialize_events_original(events)).encode(),
+        "full + orjson": lambda: orjson.dumps(serialization.serialize_events(events)),
+        "compact + orjson": lambda: orjson.dumps(serialization.serialize_events_compact(events)),
+        "cached compact + orjson": (
+            lambda cached=serialization.serialize_events_compact(events): orjson.dumps(cached)
+        ),
+    }
+
+    print(f"Serializing {count} events (best of 5 runs)")
+    baseline = None
+    for name, func in cases.items():
+        best = min(timeit.repeat(func, number=1, repeat=5))
+        size = len(func())
+        baseline = baseline or best
+        print(f"{name:<26} {best * 1000:8.2f} ms  {size / 1024:8.1f} KiB  {baseline / best:5.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""Check the panel's frontend against size and first-paint budgets.
+
+Builds the production bundle the way the integration serves it and fails
+if the compressed transfer sizes or the bytes needed before the first
+paint grow past their budgets. Run it before releasing frontend changes.
+
+Usage: python benchmarks/check_frontend_budget.py
+"""
+import importlib.util
+import os
+import re
+import sys
+
+COMPONENT_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)),
+    "..",
+    "custom_components",
+    "family_calendar",
+)
+
+# Load the module directly so Home Assistant does not need to be installed
+_spec = importlib.util.spec_from_file_location(
+    "bundler", os.path.join(COMPONENT_PATH, "bundler.py")
+)
+bundler = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(bundler)
+
+# Gzipped bytes per file
+SIZE_BUDGETS = {
+    bundler.PANEL_FILE: 8 * 1024,
+    bundler.BUNDLE_JS: 16 * 1024,
+    bundler.BUNDLE_CSS: 4 * 1024,
+}
+
+# First paint: the gzipped page must be all that is needed to paint the
+# header and grid, with no local render-blocking requests before it
+FIRST_PAINT_BYTES = 8 * 1024
+LOCAL_STYLESHEET = re.compile(r'<link rel="stylesheet" href="/[^>]*>')
+NOSCRIPT = re.compile(r"<noscript>.*?</noscript>", re.S)
+
+
+def main():
+    """Build the bundle, print the sizes and exit non-zero when over budget."""
+    panel, assets = bundler.build_assets(
+        os.path.join(COMPONENT_PATH, "www"), "/family_calendar_assets"
+    )
+    failures = []
+
+    print(f"{'file':<14} {'raw':>9} {'gzip':>9} {'budget':>9}")
+    for asset in [panel, *assets.values()]:
+        size = len(asset.encodings["gzip"])
+        budget = SIZE_BUDGETS.get(asset.name)
+        print(f"{asset.name:<14} {len(asset.body):>9} {size:>9} {budget or '-':>9}")
+        if budget is not None and size > budget:
+            failures.append(f"{asset.name} is {size} bytes gzipped, budget {budget}")
+
+    html = panel.body.decode("utf-8")
+    first_paint = len(panel.encodings["gzip"])
+    print(f"first paint    {first_paint:>19} {FIRST_PAINT_BYTES:>9}")
+    if first_paint > FIRST_PAINT_BYTES:
+        failures.append(f"first paint needs {first_paint} bytes, budget {FIRST_PAINT_BYTES}")
+    for tag in LOCAL_STYLESHEET.findall(NOSCRIPT.sub("", html)):
+        if 'media="print"' not in tag:
+            failures.append(f"render-blocking stylesheet in the panel page: {tag}")
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,60 +1,168 @@
 """Family Calendar Integration."""
-import inspect
+import hashlib
 import logging
-from datetime import datetime
+import time
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.components import frontend
-from homeassistant.components.calendar import DOMAIN as CALENDAR_DOMAIN
 from homeassistant.components.http import HomeAssistantView, StaticPathConfig
+from homeassistant.helpers.json import json_bytes
 import os
 from aiohttp import web
 
+from .assets import FrontendAssets
+from .bundler import PANEL_FILE
+from .const import (
+    ASSETS_URL,
+    CONF_CACHE_TTL,
+    CONF_DEBUG_FRONTEND,
+    CONF_FETCH_TIMEOUT,
+    CONF_PREFETCH_DEPTH,
+    CONF_TIMING_LOG_RATE,
+    CONF_UPSTREAM_CONCURRENCY,
+    CONF_UPSTREAM_RATE,
+    DEFAULT_CACHE_TTL,
+    DEFAULT_FETCH_TIMEOUT,
+    DEFAULT_PREFETCH_DEPTH,
+    DEFAULT_TIMING_LOG_RATE,
+    DEFAULT_UPSTREAM_LIMITS,
+    MAX_BATCH_OPERATIONS,
+    STATIC_URL,
+    UPSTREAM_PLATFORMS,
+)
+from .cache import EventCache
+from .events import (
+    async_fetch_many_serialized_events,
+    async_get_serialized_events,
+    parse_window,
+    sync_events,
+)
+from .metrics import PROMETHEUS_CONTENT_TYPE, Metrics
+from .prefetch import EventPrefetcher
+from .resolver import CalendarResolver
+from .runtime import FamilyCalendarData, FamilyCalendarRuntime, get_runtime, settings_entry
+from .scheduler import UpstreamScheduler
+from .serialization import FORMAT_FULL, FORMATS
+from .services import async_register_services
+from .snapshot import EventSnapshot
+from .store import EventStore
+from .sync import SyncTracker
+from .timing import phase, timed_view
+from .weather import WeatherForecastCache
+from .websocket import async_register_websocket_commands
+from .writer import (
+    WriteError,
+    async_create_event,
+    async_delete_event,
+    async_run_operations,
+    async_update_event,
+)
+
 _LOGGER = logging.getLogger(__name__)
 
 DOMAIN = "family_calendar"
 
-async def _async_register_static_path(hass: HomeAssistant):
-    """Register the static path for frontend files."""
+# Set on events responses served from the snapshot while a refresh runs
+STALE_HEADER = "X-Family-Calendar-Stale"
+
+
+def _etag_matches(request, etag):
+    """Return True if the request's If-None-Match covers etag."""
+    if_none_match = request.headers.get("If-None-Match")
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return etag in candidates or f"W/{etag}" in candidates
+
+
+def _conditional_json_response(request, data=None, body=None, etag=None):
+    """Return a JSON response with an ETag, or 304 if the client has it.
+
+    Either data (encoded with Home Assistant's orjson helper) or a
+    pre-encoded body can be given. Clients
+    may store the response but must revalidate it on every use.
+    """
+    with phase("encode"):
+        if body is None:
+            body = json_bytes(data)
+        if etag is None:
+            etag = f'"{hashlib.sha1(body).hexdigest()}"'
+
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if _etag_matches(request, etag):
+        return web.Response(status=304, headers=headers)
+    return web.Response(body=body, content_type="application/json", headers=headers)
+
+
+def _www_path():
+    """Return the folder holding the frontend files."""
     # Use realpath to resolve any symlinks (common in HACS setups)
     file_path = os.path.realpath(__file__)
     dir_path = os.path.dirname(file_path)
-    path = os.path.join(dir_path, "www")
+    return os.path.join(dir_path, "www")
+
+
+async def _async_register_static_path(hass: HomeAssistant):
+    """Register the static path for frontend files."""
+    path = _www_path()
     
-    _LOGGER.info(f"Family Calendar: Registering static path: {path}")
+    _LOGGER.debug(f"Family Calendar: Registering static path: {path}")
     
-    # Use executor to avoid blocking the event loop with file I/O
-    def check_path_contents(p):
-        if os.path.exists(p):
-            return os.listdir(p)
-        return None
-
-    try:
-        contents = await hass.async_add_executor_job(check_path_contents, path)
-        if contents is not None:
-            _LOGGER.info(f"Family Calendar: Path exists. Contents: {contents}")
-        else:
-            _LOGGER.error(f"Family Calendar: Path does not exist at {path}")
-    except Exception as e:
-        _LOGGER.error(f"Family Calendar: Error checking path: {e}")
-        
-    # Check if http component is loaded
-    if "http" not in hass.config.components:
-        _LOGGER.warning("Family Calendar: HTTP component not found in hass.config.components")
-        
     try:
         await hass.http.async_register_static_paths([
-            StaticPathConfig("/family_calendar_static", path, False)
+            StaticPathConfig(STATIC_URL, path, False)
         ])
     except TypeError:
         # Fallback for older HA versions that expect a tuple
         _LOGGER.warning("Family Calendar: Falling back to tuple for static path registration")
-        await hass.http.async_register_static_paths([("/family_calendar_static", path)])
+        await hass.http.async_register_static_paths([(STATIC_URL, path)])
+
+
+@callback
+def _async_register_views(hass: HomeAssistant):
+    """Register the API views."""
+    for view_class in VIEWS:
+        try:
+            hass.http.register_view(view_class(hass))
+            _LOGGER.debug(f"Registered {view_class.__name__}")
+        except Exception as e:
+            _LOGGER.error(f"Failed to register {view_class.__name__}: {e}")
 
 async def async_setup(hass: HomeAssistant, config: dict) -> bool:
-    """Set up the integration."""
-    hass.data.setdefault(DOMAIN, {})
+    """Set up the integration.
+
+    Views, static files, websocket commands and services are registered here
+    exactly once, so setting up an entry does not get slower as calendars
+    are added.
+    """
+    started = time.monotonic()
+    runtime = hass.data[DOMAIN] = FamilyCalendarRuntime(
+        event_cache=EventCache(),
+        event_store=EventStore(),
+        scheduler=UpstreamScheduler(),
+        sync_tracker=SyncTracker(),
+        snapshot=EventSnapshot(hass),
+        resolver=CalendarResolver(hass),
+        prefetcher=EventPrefetcher(hass),
+        metrics=Metrics(),
+        weather_cache=WeatherForecastCache(hass),
+        frontend_assets=FrontendAssets(hass, _www_path()),
+    )
+    # Last known events, served while providers are still slow after a restart
+    await runtime.snapshot.async_load()
+    snapshot_loaded = time.monotonic()
+    
+    async_register_websocket_commands(hass)
+    async_register_services(hass)
+    _async_register_views(hass)
     await _async_register_static_path(hass)
+    
+    _LOGGER.debug(
+        f"Set up in {(time.monotonic() - started) * 1000:.1f} ms "
+        f"(snapshot load {(snapshot_loaded - started) * 1000:.1f} ms)"
+    )
     return True
 
 
@@ -69,36 +177,29 @@ class FamilyCalendarWeatherView(HomeAssistantView):
         """Initialize the view."""
         self.hass = hass
 
+    @timed_view("weather")
     async def get(self, request):
         """Handle GET request for weather."""
-        weather_entity = self.hass.data.get(DOMAIN, {}).get("weather_entity")
+        runtime = get_runtime(self.hass)
+        weather_entity = runtime.data.weather_entity
         
         if not weather_entity:
             return web.json_response({"error": "No weather entity configured"}, status=404)
             
+        weather_cache = runtime.weather_cache
         try:
-            # Try to get forecast using the service (modern way)
-            if self.hass.services.has_service("weather", "get_forecasts"):
-                response = await self.hass.services.async_call(
-                    "weather",
-                    "get_forecasts",
-                    {"entity_id": weather_entity, "type": "daily"},
-                    blocking=True,
-                    return_response=True
-                )
-                if response and weather_entity in response:
-                    return web.json_response(response[weather_entity].get("forecast", []))
-            
-            # Fallback to state attributes (legacy way)
-            state = self.hass.states.get(weather_entity)
-            if state and "forecast" in state.attributes:
-                return web.json_response(state.attributes["forecast"])
-                
-            return web.json_response({"error": "No forecast data available"}, status=404)
-            
+            with phase("forecast"):
+                body, etag = await weather_cache.async_get(weather_entity)
         except Exception as e:
             _LOGGER.error(f"Error fetching weather: {e}")
             return web.json_response({"error": str(e)}, status=500)
+        
+        if body is None:
+            if weather_cache.error:
+                return web.json_response({"error": weather_cache.error}, status=500)
+            return web.json_response({"error": "No forecast data available"}, status=404)
+        
+        return _conditional_json_response(request, body=body, etag=etag)
 
 
 class FamilyCalendarEventsView(HomeAssistantView):
@@ -112,6 +213,7 @@ class FamilyCalendarEventsView(HomeAssistantView):
         """Initialize the view."""
         self.hass = hass
 
+    @timed_view("events")
     async def get(self, request):
         """Handle GET request for events."""
         calendar_entity = request.query.get("calendar")
@@ -121,90 +223,110 @@ class FamilyCalendarEventsView(HomeAssistantView):
         if not calendar_entity or not start or not end:
             return web.json_response({"error": "Missing parameters"}, status=400)
         
+        fmt = request.query.get("format", FORMAT_FULL)
+        if fmt not in FORMATS:
+            return web.json_response({"error": f"Unknown format: {fmt}"}, status=400)
+        
         try:
-            from datetime import datetime
-            
             _LOGGER.debug(f"Proxy: Fetching events for {calendar_entity}")
             
-            start_dt = datetime.fromisoformat(start.replace('Z', '+00:00'))
-            end_dt = datetime.fromisoformat(end.replace('Z', '+00:00'))
-            
-            # Get all calendar entities from the entity registry
-            from homeassistant.helpers import entity_registry as er
-            
-            entity_reg = er.async_get(self.hass)
-            entity_entry = entity_reg.async_get(calendar_entity)
-            
-            if not entity_entry:
-                _LOGGER.warning(f"Entity not found in registry: {calendar_entity}")
-                return web.json_response([])
-            
-            # Get the state to verify it exists
-            state = self.hass.states.get(calendar_entity)
-            if not state:
-                _LOGGER.warning(f"Entity state not found: {calendar_entity}")
-                return web.json_response([])
-            
-            # Try to get the entity object from the platform
-            # Calendar entities are typically in the calendar domain
-            from homeassistant.components.calendar import DOMAIN as CALENDAR_DOMAIN
-            
-            # Get calendar platform entities
-            if "entity_components" not in self.hass.data:
-                _LOGGER.error("entity_components not in hass.data")
-                return web.json_response([])
-            
-            entity_component = self.hass.data["entity_components"].get(CALENDAR_DOMAIN)
-            if not entity_component:
-                _LOGGER.error(f"Calendar component not found")
-                return web.json_response([])
-            
-            # Find the entity
-            calendar_entity_obj = entity_component.get_entity(calendar_entity)
-            if not calendar_entity_obj:
-                _LOGGER.warning(f"Calendar entity object not found: {calendar_entity}")
+            start_dt, end_dt = parse_window(start, end)
+            events_list, stale = await async_get_serialized_events(
+                self.hass, calendar_entity, start_dt, end_dt, fmt
+            )
+            if events_list is None:
                 return web.json_response([])
             
-            # Get events
-            _LOGGER.debug(f"Calling async_get_events on {calendar_entity}")
-            events = await calendar_entity_obj.async_get_events(self.hass, start_dt, end_dt)
-            
-            # Convert to dict format
-            events_list = []
-            for event in events:
-                event_dict = {
-                    "summary": event.summary,
-                    "start": {},
-                    "end": {},
-                }
-                
-                # Check if it's an all-day event
-                if not hasattr(event.start, 'hour'):
-                    # All-day event
-                    event_dict["start"]["date"] = event.start.strftime("%Y-%m-%d")
-                    event_dict["end"]["date"] = event.end.strftime("%Y-%m-%d")
-                else:
-                    # Timed event
-                    event_dict["start"]["dateTime"] = event.start.isoformat()
-                    event_dict["end"]["dateTime"] = event.end.isoformat()
-                
-                if hasattr(event, 'description') and event.description:
-                    event_dict["description"] = event.description
-                if hasattr(event, 'location') and event.location:
-                    event_dict["location"] = event.location
-                if hasattr(event, 'uid') and event.uid:
-                    event_dict["uid"] = event.uid
-                
-                events_list.append(event_dict)
-            
             _LOGGER.debug(f"Proxy: Returning {len(events_list)} events for {calendar_entity}")
-            return web.json_response(events_list)
+            get_runtime(self.hass).prefetcher.schedule([calendar_entity], start_dt, end_dt, fmt)
+            
+            # Incremental sync: only return what changed since the client's token
+            if "since" in request.query or request.query.get("sync"):
+                since_tokens = [t for t in request.query.get("since", "").split(",") if t]
+                response = _conditional_json_response(
+                    request,
+                    sync_events(
+                        self.hass, calendar_entity, start_dt, end_dt, events_list, since_tokens, fmt
+                    ),
+                )
+            else:
+                response = _conditional_json_response(request, events_list)
+            
+            if stale:
+                response.headers[STALE_HEADER] = "1"
+            return response
             
         except Exception as e:
             _LOGGER.error(f"Proxy error fetching events: {e}", exc_info=True)
             return web.json_response({"error": str(e)}, status=500)
 
 
+class FamilyCalendarBatchEventsView(HomeAssistantView):
+    """View to return events for several calendars in one request."""
+
+    url = "/api/family_calendar/events/batch"
+    name = "api:family_calendar:events:batch"
+    requires_auth = False
+
+    def __init__(self, hass: HomeAssistant):
+        """Initialize the view."""
+        self.hass = hass
+
+    @timed_view("batch")
+    async def get(self, request):
+        """Handle GET request for events of multiple calendars."""
+        calendar_entities = [
+            entity
+            for value in request.query.getall("calendars", [])
+            for entity in value.split(",")
+            if entity
+        ]
+        start = request.query.get("start")
+        end = request.query.get("end")
+        
+        if not calendar_entities or not start or not end:
+            return web.json_response({"error": "Missing parameters"}, status=400)
+        
+        try:
+            start_dt, end_dt = parse_window(start, end)
+        except ValueError as e:
+            return web.json_response({"error": str(e)}, status=400)
+        
+        fmt = request.query.get("format", FORMAT_FULL)
+        if fmt not in FORMATS:
+            return web.json_response({"error": f"Unknown format: {fmt}"}, status=400)
+        
+        sync = "since" in request.query or bool(request.query.get("sync"))
+        since_tokens = [t for t in request.query.get("since", "").split(",") if t]
+        
+        # De-duplicate while keeping the requested order
+        calendar_entities = list(dict.fromkeys(calendar_entities))
+        _LOGGER.debug(f"Proxy: Batch fetching events for {len(calendar_entities)} calendars")
+        
+        events_by_calendar, errors, stale = await async_fetch_many_serialized_events(
+            self.hass, calendar_entities, start_dt, end_dt, fmt
+        )
+        get_runtime(self.hass).prefetcher.schedule(calendar_entities, start_dt, end_dt, fmt)
+        if sync:
+            events_by_calendar = {
+                entity: sync_events(
+                    self.hass, entity, start_dt, end_dt, events_list, since_tokens, fmt
+                )
+                for entity, events_list in events_by_calendar.items()
+            }
+        
+        return _conditional_json_response(
+            request,
+            {
+                "events": events_by_calendar,
+                "errors": errors,
+                "stale": stale,
+                "sync": sync,
+                "format": fmt,
+            },
+        )
+
+
 class FamilyCalendarAddEventView(HomeAssistantView):
     """View to add events to calendars."""
 
@@ -216,6 +338,7 @@ class FamilyCalendarAddEventView(HomeAssistantView):
         """Initialize the view."""
         self.hass = hass
 
+    @timed_view("add_event")
     async def post(self, request):
         """Handle POST request to add event."""
         try:
@@ -233,81 +356,20 @@ class FamilyCalendarAddEventView(HomeAssistantView):
             if not all([calendar_entity, summary, start_date_time, end_date_time]):
                 return web.json_response({"error": "Missing required fields"}, status=400)
             
-            # Build service data for Google Calendar
-            # Google service expects strings in format "YYYY-MM-DD HH:MM:SS"
-            google_service_data = {
-                "entity_id": calendar_entity,
-                "summary": summary,
-                "start_date_time": start_date_time,
-                "end_date_time": end_date_time,
-            }
-            
-            if description:
-                google_service_data["description"] = description
-            if location:
-                google_service_data["location"] = location
-            
-            _LOGGER.debug(f"Calling google.create_event for {calendar_entity}")
-            _LOGGER.debug(f"Google service data: {google_service_data}")
-            
-            # Try google.create_event first (for Google Calendar)
             try:
-                await self.hass.services.async_call(
-                    "google",
-                    "create_event",
-                    google_service_data,
-                    blocking=True
+                await async_create_event(
+                    self.hass,
+                    calendar_entity,
+                    summary,
+                    start_date_time,
+                    end_date_time,
+                    description,
+                    location,
                 )
-                _LOGGER.info(f"Successfully created event '{summary}' using google.create_event")
-                return web.json_response({"success": True})
-            except Exception as google_error:
-                _LOGGER.error(f"google.create_event failed: {type(google_error).__name__}: {google_error}")
-                
-                # Parse datetime for fallback
-                start_dt = datetime.strptime(start_date_time, "%Y-%m-%d %H:%M:%S")
-                end_dt = datetime.strptime(end_date_time, "%Y-%m-%d %H:%M:%S")
-                
-                # Build fallback service data for calendar.create_event
-                calendar_service_data = {
-                    "entity_id": calendar_entity,
-                    "summary": summary,
-                    "start_date_time": start_dt,
-                    "end_date_time": end_dt,
-                }
-                
-                if description:
-                    calendar_service_data["description"] = description
-                if location:
-                    calendar_service_data["location"] = location
-                
-                _LOGGER.debug(f"Trying fallback: calendar.create_event")
-                
-                # Fall back to calendar.create_event for other calendar types
-                try:
-                    await self.hass.services.async_call(
-                        "calendar",
-                        "create_event",
-                        calendar_service_data,
-                        blocking=True
-                    )
-                    _LOGGER.info(f"Successfully created event '{summary}' using calendar.create_event")
-                    return web.json_response({"success": True})
-                except Exception as calendar_error:
-                    google_msg = str(google_error)
-                    calendar_msg = str(calendar_error)
-                    _LOGGER.error(f"calendar.create_event also failed: {calendar_msg}")
-                    
-                    permission_error = (
-                        "This calendar is read-only or missing write permissions. "
-                        "Select a calendar that supports event creation (Local/CalDAV) or reconfigure the Google integration "
-                        "with write access."
-                    )
-                    return web.json_response({
-                        "error": permission_error,
-                        "calendar": calendar_entity,
-                        "google_error": google_msg,
-                        "calendar_error": calendar_msg
-                    }, status=403)
+            except WriteError as err:
+                return web.json_response(err.as_dict(), status=err.status)
+            
+            return web.json_response({"success": True})
             
         except Exception as e:
             _LOGGER.error(f"Failed to create event: {e}", exc_info=True)
@@ -325,6 +387,7 @@ class FamilyCalendarUpdateEventView(HomeAssistantView):
         """Initialize the view."""
         self.hass = hass
 
+    @timed_view("update_event")
     async def post(self, request):
         """Handle POST request to update event."""
         try:
@@ -343,155 +406,21 @@ class FamilyCalendarUpdateEventView(HomeAssistantView):
             if not all([calendar_entity, event_uid, summary, start_date_time, end_date_time]):
                 return web.json_response({"error": "Missing required fields"}, status=400)
             
-            # Strategy: Delete the old event and create a new one
-            # This is the most compatible approach across different calendar integrations
-            
-            # Step 1: Try to delete the existing event using multiple methods
-            _LOGGER.info(f"Attempting to delete event {event_uid} from {calendar_entity}")
-            
-            delete_payload = {
-                "entity_id": calendar_entity,
-                "event_id": event_uid,
-                "uid": event_uid,
-            }
-            
-            deletion_success = False
-            deletion_attempts = []
-            
-            # Try all available delete services
-            for domain, service in (
-                ("google", "delete_event"),
-                ("google", "remove_event"),
-                ("calendar", "delete_event"),
-                ("calendar", "remove_event"),
-            ):
-                if not self.hass.services.has_service(domain, service):
-                    continue
-
-                try:
-                    await self.hass.services.async_call(
-                        domain,
-                        service,
-                        delete_payload,
-                        blocking=True,
-                    )
-                    _LOGGER.info(f"Successfully deleted old event {event_uid} using {domain}.{service}")
-                    deletion_success = True
-                    break
-                except Exception as e:
-                    msg = f"{domain}.{service} failed: {e}"
-                    _LOGGER.debug(msg)
-                    deletion_attempts.append(msg)
-            
-            # If services didn't work, try direct entity method
-            if not deletion_success:
-                from homeassistant.components.calendar import DOMAIN as CALENDAR_DOMAIN
-                
-                entity_component = self.hass.data.get("entity_components", {}).get(CALENDAR_DOMAIN)
-                calendar_entity_obj = None
-                if entity_component:
-                    calendar_entity_obj = entity_component.get_entity(calendar_entity)
-                
-                if calendar_entity_obj:
-                    _LOGGER.debug(f"Attempting direct entity delete for {calendar_entity}")
-                    for attr_name in ("async_delete_event", "async_remove_event", "delete_event", "remove_event"):
-                        handler = getattr(calendar_entity_obj, attr_name, None)
-                        if not handler:
-                            continue
-                        
-                        try:
-                            if attr_name.startswith("async_"):
-                                await handler(event_uid)
-                            else:
-                                await self.hass.async_add_executor_job(handler, event_uid)
-                            
-                            _LOGGER.info(f"Successfully deleted event {event_uid} using entity method {attr_name}")
-                            deletion_success = True
-                            break
-                        except Exception as e:
-                            msg = f"Entity method {attr_name} failed: {e}"
-                            _LOGGER.debug(msg)
-                            deletion_attempts.append(msg)
-            
-            if not deletion_success:
-                _LOGGER.warning(f"Could not delete old event {event_uid}. Attempts: {deletion_attempts}")
-                # Continue anyway - maybe the event doesn't exist anymore
-            else:
-                # Wait a moment for deletion to propagate
-                import asyncio
-                await asyncio.sleep(0.5)
-            
-            # Step 2: Create the updated event
-            google_service_data = {
-                "entity_id": calendar_entity,
-                "summary": summary,
-                "start_date_time": start_date_time,
-                "end_date_time": end_date_time,
-            }
-            
-            if description:
-                google_service_data["description"] = description
-            if location:
-                google_service_data["location"] = location
-            
-            _LOGGER.debug(f"Creating updated event in: {calendar_entity}")
-            
-            # Try google.create_event first (for Google Calendar)
             try:
-                await self.hass.services.async_call(
-                    "google",
-                    "create_event",
-                    google_service_data,
-                    blocking=True
+                await async_update_event(
+                    self.hass,
+                    calendar_entity,
+                    event_uid,
+                    summary,
+                    start_date_time,
+                    end_date_time,
+                    description,
+                    location,
                 )
-                _LOGGER.info(f"Successfully updated event '{summary}' using google.create_event")
-                return web.json_response({"success": True})
-            except Exception as google_error:
-                _LOGGER.error(f"google.create_event failed: {type(google_error).__name__}: {google_error}")
-                
-                # Parse datetime for fallback
-                start_dt = datetime.strptime(start_date_time, "%Y-%m-%d %H:%M:%S")
-                end_dt = datetime.strptime(end_date_time, "%Y-%m-%d %H:%M:%S")
-                
-                # Build fallback service data for calendar.create_event
-                calendar_service_data = {
-                    "entity_id": calendar_entity,
-                    "summary": summary,
-                    "start_date_time": start_dt,
-                    "end_date_time": end_dt,
-                }
-                
-                if description:
-                    calendar_service_data["description"] = description
-                if location:
-                    calendar_service_data["location"] = location
-                
-                _LOGGER.debug(f"Trying fallback: calendar.create_event")
-                
-                # Fall back to calendar.create_event for other calendar types
-                try:
-                    await self.hass.services.async_call(
-                        "calendar",
-                        "create_event",
-                        calendar_service_data,
-                        blocking=True
-                    )
-                    _LOGGER.info(f"Successfully updated event '{summary}' using calendar.create_event")
-                    return web.json_response({"success": True})
-                except Exception as calendar_error:
-                    google_msg = str(google_error)
-                    calendar_msg = str(calendar_error)
-                    _LOGGER.error(f"calendar.create_event also failed: {calendar_msg}")
-                    
-                    permission_error = (
-                        "Failed to update event. The calendar may be read-only or missing write permissions."
-                    )
-                    return web.json_response({
-                        "error": permission_error,
-                        "calendar": calendar_entity,
-                        "google_error": google_msg,
-                        "calendar_error": calendar_msg
-                    }, status=403)
+            except WriteError as err:
+                return web.json_response(err.as_dict(), status=err.status)
+            
+            return web.json_response({"success": True})
             
         except Exception as e:
             _LOGGER.error(f"Failed to update event: {e}", exc_info=True)
@@ -509,6 +438,7 @@ class FamilyCalendarDeleteEventView(HomeAssistantView):
         """Initialize the view."""
         self.hass = hass
 
+    @timed_view("delete_event")
     async def post(self, request):
         """Handle POST request to delete an event."""
         try:
@@ -525,101 +455,120 @@ class FamilyCalendarDeleteEventView(HomeAssistantView):
                 "Delete event request for %s (event %s)", calendar_entity, event_uid
             )
 
-            # Provide multiple attribute names since integrations differ on payloads
-            service_payload = {
-                "entity_id": calendar_entity,
-                "event_id": event_uid,
-                "uid": event_uid,
-            }
+            try:
+                await async_delete_event(self.hass, calendar_entity, event_uid)
+            except WriteError as err:
+                return web.json_response(err.as_dict(), status=err.status)
+            
+            return web.json_response({"success": True})
 
-            deletion_attempts = []
-            for domain, service in (
-                ("google", "delete_event"),
-                ("google", "remove_event"),
-                ("calendar", "delete_event"),
-                ("calendar", "remove_event"),
-            ):
-                if not self.hass.services.has_service(domain, service):
-                    continue
-
-                try:
-                    await self.hass.services.async_call(
-                        domain,
-                        service,
-                        service_payload,
-                        blocking=True,
-                    )
-                    _LOGGER.info(
-                        "Deleted event %s from %s using %s.%s",
-                        event_uid,
-                        calendar_entity,
-                        domain,
-                        service,
-                    )
-                    return web.json_response({"success": True})
-                except Exception as service_error:
-                    msg = f"{domain}.{service} failed: {service_error}"
-                    _LOGGER.error(msg)
-                    deletion_attempts.append(msg)
-
-            entity_component = self.hass.data.get("entity_components", {}).get(
-                CALENDAR_DOMAIN
-            )
-            calendar_entity_obj = None
-            if entity_component:
-                calendar_entity_obj = entity_component.get_entity(calendar_entity)
+        except Exception as error:
+            _LOGGER.error(f"Failed to delete event: {error}", exc_info=True)
+            return web.json_response({"error": str(error)}, status=500)
 
-            if calendar_entity_obj:
-                _LOGGER.debug(
-                    "Attempting direct entity delete for %s", calendar_entity
-                )
-                for attr_name in (
-                    "async_delete_event",
-                    "async_remove_event",
-                    "delete_event",
-                    "remove_event",
-                ):
-                    handler = getattr(calendar_entity_obj, attr_name, None)
-                    if not handler:
-                        continue
-
-                    try:
-                        result = handler(event_uid)
-                        if inspect.isawaitable(result):
-                            await result
-                        _LOGGER.info(
-                            "Deleted event %s from %s via entity.%s",
-                            event_uid,
-                            calendar_entity,
-                            attr_name,
-                        )
-                        return web.json_response({"success": True})
-                    except Exception as entity_error:
-                        msg = f"entity.{attr_name} failed: {entity_error}"
-                        _LOGGER.error(msg)
-                        deletion_attempts.append(msg)
-
-            if deletion_attempts:
+
+class FamilyCalendarBatchWriteView(HomeAssistantView):
+    """View to add, update and delete many events in one request."""
+
+    url = "/api/family_calendar/events/batch_write"
+    name = "api:family_calendar:events_batch_write"
+    # Bulk deletes and rewrites are not for anonymous callers; the panel
+    # does not use this view
+    requires_auth = True
+
+    def __init__(self, hass: HomeAssistant):
+        """Initialize the view."""
+        self.hass = hass
+
+    @timed_view("batch_write")
+    async def post(self, request):
+        """Handle POST request with a list of operations.
+
+        Body: {"operations": [{"op": "add"|"update"|"delete", "calendar_entity": ..., ...}]}
+        with the same fields as the single-event views. Returns one result per
+        operation, in order.
+        """
+        try:
+            data = await request.json()
+            operations = data.get("operations")
+
+            if not isinstance(operations, list) or not all(
+                isinstance(operation, dict) for operation in operations
+            ):
+                return web.json_response({"error": "operations must be a list of objects"}, status=400)
+            if len(operations) > MAX_BATCH_OPERATIONS:
                 return web.json_response(
-                    {
-                        "error": "Unable to delete event – calendar may be read-only or does not expose a supported delete service.",
-                        "calendar": calendar_entity,
-                        "details": deletion_attempts,
-                    },
-                    status=403,
+                    {"error": f"At most {MAX_BATCH_OPERATIONS} operations per request"}, status=400
                 )
 
+            _LOGGER.debug(f"Batch write request with {len(operations)} operations")
+
+            results = await async_run_operations(self.hass, operations)
             return web.json_response(
-                {
-                    "error": "No supported calendar delete service available in Home Assistant.",
-                    "calendar": calendar_entity,
-                },
-                status=501,
+                {"success": all(result["success"] for result in results), "results": results}
             )
 
-        except Exception as error:
-            _LOGGER.error(f"Failed to delete event: {error}", exc_info=True)
-            return web.json_response({"error": str(error)}, status=500)
+        except Exception as e:
+            _LOGGER.error(f"Failed to run batch write: {e}", exc_info=True)
+            return web.json_response({"error": str(e)}, status=500)
+
+class FamilyCalendarAssetsView(HomeAssistantView):
+    """View to serve the panel and its content-hashed, precompressed assets.
+
+    Serves the minified bundle, or the raw files in frontend debug mode.
+    """
+
+    url = ASSETS_URL + "/{path:.+}"
+    name = "family_calendar:assets"
+    requires_auth = False
+
+    def __init__(self, hass: HomeAssistant):
+        """Initialize the view."""
+        self.hass = hass
+
+    @timed_view("assets")
+    async def get(self, request, path):
+        """Handle GET request for the panel page or an asset."""
+        frontend_assets = get_runtime(self.hass).frontend_assets
+        try:
+            # Only the first request after startup or a debug toggle builds
+            with phase("build"):
+                await frontend_assets.async_load()
+        except OSError as e:
+            _LOGGER.error(f"Failed to load frontend assets: {e}")
+            return web.json_response({"error": "Frontend assets not available"}, status=500)
+        
+        if path == PANEL_FILE:
+            # The page itself is revalidated so it picks up new asset URLs
+            asset = frontend_assets.panel
+            cache_control = "no-cache"
+        else:
+            digest, _, name = path.partition("/")
+            asset = frontend_assets.assets.get(name)
+            if asset is None:
+                return web.Response(status=404)
+            if digest == asset.digest:
+                cache_control = "public, max-age=31536000, immutable"
+            else:
+                # A page from before an upgrade; serve the current file uncached
+                cache_control = "no-cache"
+        
+        etag = f'"{asset.digest}"'
+        headers = {
+            "Cache-Control": cache_control,
+            "ETag": etag,
+            "Vary": "Accept-Encoding",
+        }
+        if _etag_matches(request, etag):
+            return web.Response(status=304, headers=headers)
+        
+        body, encoding = asset.negotiate(request.headers.get("Accept-Encoding"))
+        if encoding:
+            headers["Content-Encoding"] = encoding
+        return web.Response(
+            body=body, content_type=asset.content_type, charset="utf-8", headers=headers
+        )
+
 
 class FamilyCalendarConfigView(HomeAssistantView):
     """View to return family calendar configuration."""
@@ -632,89 +581,84 @@ class FamilyCalendarConfigView(HomeAssistantView):
         """Initialize the view."""
         self.hass = hass
 
+    @timed_view("config")
     async def get(self, request):
         """Handle GET request."""
-        calendars = self.hass.data.get(DOMAIN, {}).get("calendars", [])
-        colors = self.hass.data.get(DOMAIN, {}).get("colors", {})
-        names = self.hass.data.get(DOMAIN, {}).get("names", {})
-        weather_entity = self.hass.data.get(DOMAIN, {}).get("weather_entity")
+        data = get_runtime(self.hass).data
         
-        _LOGGER.debug(f"API called - returning {len(calendars)} calendars")
+        _LOGGER.debug(f"API called - returning {len(data.calendars)} calendars")
         
-        return web.json_response({
-            "calendars": calendars,
-            "colors": colors,
-            "names": names,
-            "weather_entity": weather_entity
-        })
+        return _conditional_json_response(request, data.as_config())
+
+class FamilyCalendarMetricsView(HomeAssistantView):
+    """View to return the integration's metrics in Prometheus text format."""
+
+    url = "/api/family_calendar/metrics"
+    name = "api:family_calendar:metrics"
+    # Unlike the panel's views, scrapers authenticate with a long-lived token
+    requires_auth = True
+
+    def __init__(self, hass: HomeAssistant):
+        """Initialize the view."""
+        self.hass = hass
+
+    @timed_view("metrics")
+    async def get(self, request):
+        """Handle GET request for metrics."""
+        # The content_type argument cannot carry the version parameter
+        return web.Response(
+            body=get_runtime(self.hass).metrics.prometheus_text().encode("utf-8"),
+            headers={"Content-Type": PROMETHEUS_CONTENT_TYPE, "Cache-Control": "no-store"},
+        )
+
+VIEWS = (
+    FamilyCalendarConfigView,
+    FamilyCalendarEventsView,
+    FamilyCalendarBatchEventsView,
+    FamilyCalendarAddEventView,
+    FamilyCalendarUpdateEventView,
+    FamilyCalendarDeleteEventView,
+    FamilyCalendarBatchWriteView,
+    FamilyCalendarWeatherView,
+    FamilyCalendarAssetsView,
+    FamilyCalendarMetricsView,
+)
+
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up from config entry."""
-    hass.data.setdefault(DOMAIN, {})
-    
-    # Register the API views - check each one individually
-    views_to_register = [
-        (FamilyCalendarConfigView, '_config_view_registered'),
-        (FamilyCalendarEventsView, '_events_view_registered'),
-        (FamilyCalendarAddEventView, '_add_event_view_registered'),
-        (FamilyCalendarUpdateEventView, '_update_event_view_registered'),
-        (FamilyCalendarDeleteEventView, '_delete_event_view_registered'),
-        (FamilyCalendarWeatherView, '_weather_view_registered'),
-    ]
-
-    for view_class, flag in views_to_register:
-        if flag not in hass.data[DOMAIN]:
-            try:
-                hass.http.register_view(view_class(hass))
-                hass.data[DOMAIN][flag] = True
-                _LOGGER.debug(f"Registered {view_class.__name__}")
-            except Exception as e:
-                _LOGGER.error(f"Failed to register {view_class.__name__}: {e}")
+    started = time.monotonic()
+    runtime = get_runtime(hass)
     
-    # Store the calendar entity and color in the domain data
-    calendar_entity = entry.data.get("calendar_entity")
-    color = entry.data.get("color", "#2196f3")
-    name = entry.data.get("name")
-    weather_entity = entry.data.get("weather_entity")
+    # Resolve calendar entities once and keep them until the registry changes
+    runtime.resolver.async_start()
     
-    if calendar_entity:
-        if "calendars" not in hass.data[DOMAIN]:
-            hass.data[DOMAIN]["calendars"] = []
-        if calendar_entity not in hass.data[DOMAIN]["calendars"]:
-            hass.data[DOMAIN]["calendars"].append(calendar_entity)
-        
-        # Store colors separately
-        if "colors" not in hass.data[DOMAIN]:
-            hass.data[DOMAIN]["colors"] = {}
-        hass.data[DOMAIN]["colors"][calendar_entity] = color
-
-        # Store names separately
-        if "names" not in hass.data[DOMAIN]:
-            hass.data[DOMAIN]["names"] = {}
-        if name:
-            hass.data[DOMAIN]["names"][calendar_entity] = name
-            
-        # Store weather entity globally (last one wins)
-        if weather_entity:
-            hass.data[DOMAIN]["weather_entity"] = weather_entity
+    # Keep the loaded entries and rebuild the calendars, colors and names
+    runtime.entries[entry.entry_id] = entry
+    _async_update_runtime(hass)
+    _async_apply_settings(hass)
+    entry.async_on_unload(entry.add_update_listener(_async_update_listener))
     
-    hass.data[DOMAIN][entry.entry_id] = entry.data
+    if not runtime.panel_registered:
+        _async_register_panel(hass)
     
+    _LOGGER.debug(
+        f"Set up entry {entry.title} in {(time.monotonic() - started) * 1000:.1f} ms"
+    )
+    return True
+
+
+@callback
+def _async_register_panel(hass: HomeAssistant):
+    """Register the sidebar panel, once for all entries."""
     # Register the sidebar panel with a fixed URL to prevent duplicates
     panel_name = "Family Calendar"
     panel_url = "family_calendar"  # Fixed URL instead of unique per entry
     
-    # Ensure static path is registered (idempotent)
-    await _async_register_static_path(hass)
-    
     # Only register if not already registered
     # Note: We check if it's in frontend_panels to avoid duplicate registration warnings
     # but we also want to ensure it's registered if we just reloaded the integration
     
-    # Use a fixed version for cache busting to avoid confusion
-    # In production, this should match manifest version
-    version = "1.0.0"
-    
     # Always try to remove it first to ensure we have the latest config
     # This might cause the "Removing unknown panel" warning if it didn't exist, which is fine
     try:
@@ -729,35 +673,82 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         sidebar_icon="mdi:calendar-account",
         frontend_url_path=panel_url,
         config={
-            "url": f"/family_calendar_static/calendar.html?v={version}"
+            # Served by FamilyCalendarAssetsView with content-hashed asset URLs
+            "url": f"{ASSETS_URL}/{PANEL_FILE}"
         },
         require_admin=False,
     )
+    get_runtime(hass).panel_registered = True
+
+
+@callback
+def _async_update_runtime(hass: HomeAssistant):
+    """Rebuild the runtime data from the loaded entries."""
+    runtime = get_runtime(hass)
+    runtime.data = FamilyCalendarData.from_entries(runtime.entries.values())
+
+
+@callback
+def _async_apply_settings(hass: HomeAssistant, removed_entry_id=None):
+    """Apply the global settings of the settings entry, or the defaults."""
+    runtime = get_runtime(hass)
+    entry = settings_entry(
+        entry
+        for entry in hass.config_entries.async_entries(DOMAIN)
+        if entry.entry_id != removed_entry_id
+    )
+    data = entry.data if entry is not None else {}
     
-    return True
+    cache_ttl = data.get(CONF_CACHE_TTL, DEFAULT_CACHE_TTL)
+    runtime.event_cache.ttl = cache_ttl
+    runtime.event_store.ttl = cache_ttl
+    runtime.prefetcher.depth = data.get(CONF_PREFETCH_DEPTH, DEFAULT_PREFETCH_DEPTH)
+    runtime.fetch_timeout = data.get(CONF_FETCH_TIMEOUT, DEFAULT_FETCH_TIMEOUT)
+    # Share of view requests whose timings are logged
+    runtime.timing_log_rate = data.get(CONF_TIMING_LOG_RATE, DEFAULT_TIMING_LOG_RATE)
+    
+    for platform in UPSTREAM_PLATFORMS:
+        concurrency, rate = DEFAULT_UPSTREAM_LIMITS[platform]
+        runtime.scheduler.configure(
+            platform,
+            data.get(f"{platform}_{CONF_UPSTREAM_CONCURRENCY}", concurrency),
+            data.get(f"{platform}_{CONF_UPSTREAM_RATE}", rate),
+        )
+    
+    # Serve the raw frontend files instead of the minified bundle
+    runtime.frontend_assets.set_debug(data.get(CONF_DEBUG_FRONTEND, False))
+
+
+async def _async_update_listener(hass: HomeAssistant, entry: ConfigEntry):
+    """Pick up changes made in the options flow without a reload."""
+    _async_update_runtime(hass)
+    _async_apply_settings(hass)
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
-    # Remove calendar from the list
-    calendar_entity = entry.data.get("calendar_entity")
-    if calendar_entity and "calendars" in hass.data.get(DOMAIN, {}):
-        if calendar_entity in hass.data[DOMAIN]["calendars"]:
-            hass.data[DOMAIN]["calendars"].remove(calendar_entity)
+    runtime = get_runtime(hass)
+    runtime.entries.pop(entry.entry_id, None)
+    _async_update_runtime(hass)
     
     # Remove panel only if this is the last entry
     panel_url = "family_calendar"
     
-    # Check if there are other family_calendar entries
-    other_entries = [
-        e for e in hass.config_entries.async_entries(DOMAIN)
-        if e.entry_id != entry.entry_id
-    ]
-    
-    if not other_entries:
+    # Check if other family_calendar entries are still loaded
+    if not runtime.entries:
         # This is the last entry, remove the panel
         frontend.async_remove_panel(hass, panel_url)
-    
-    if entry.entry_id in hass.data[DOMAIN]:
-        hass.data[DOMAIN].pop(entry.entry_id)
+        runtime.panel_registered = False
+        
+        # Stop background weather refreshes
+        runtime.weather_cache.async_stop()
+        runtime.prefetcher.async_stop()
+        runtime.resolver.async_stop()
+        runtime.scheduler.async_stop()
     
     return True
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Hand the global settings to the next entry when the settings entry is removed."""
+    if DOMAIN in hass.data:
+        _async_apply_settings(hass, removed_entry_id=entry.entry_id)
@@ -0,0 +1,51 @@
+"""Frontend assets served by Family Calendar."""
+import asyncio
+import logging
+
+from homeassistant.core import HomeAssistant, callback
+
+from .bundler import brotli, build_assets
+from .const import ASSETS_URL
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class FrontendAssets:
+    """Build the panel and its assets once, on first use, in the executor.
+
+    In production the scripts and styles are bundled and minified; in debug
+    mode the original files are served (still content-hashed).
+    """
+
+    def __init__(self, hass: HomeAssistant, www_path, debug=False):
+        """Initialize the assets."""
+        self.hass = hass
+        self.www_path = www_path
+        self.debug = debug
+        self.panel = None
+        self.assets = {}
+        self._lock = asyncio.Lock()
+
+    @callback
+    def set_debug(self, debug):
+        """Switch between bundled and raw files, rebuilding on next use."""
+        if debug != self.debug:
+            self.debug = debug
+            self.panel = None
+            self.assets = {}
+
+    async def async_load(self):
+        """Build the assets if that did not happen yet."""
+        if self.panel is not None:
+            return
+        async with self._lock:
+            if self.panel is None:
+                panel, assets = await self.hass.async_add_executor_job(
+                    build_assets, self.www_path, ASSETS_URL, self.debug
+                )
+                self.panel, self.assets = panel, assets
+                _LOGGER.debug(
+                    f"Built {'debug' if self.debug else 'bundled'} frontend assets: "
+                    f"{', '.join(f'{a.url} ({len(a.body)} bytes)' for a in assets.values())}"
+                    f" (brotli {'on' if brotli is not None else 'off'})"
+                )
@@ -0,0 +1,366 @@
+"""Bundle, minify, hash and precompress the Family Calendar frontend.
+
+This module has no Home Assistant imports so the budget check in
+``benchmarks/check_frontend_budget.py`` can load it directly.
+"""
+import gzip
+import hashlib
+import os
+import re
+from dataclasses import dataclass, field
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+PANEL_FILE = "calendar.html"
+BUNDLE_JS = "bundle.js"
+BUNDLE_CSS = "bundle.css"
+
+# Rules above this comment in the stylesheets are inlined into the panel page
+CRITICAL_CSS_END = "/* critical:end */"
+
+CONTENT_TYPES = {
+    ".html": "text/html",
+    ".js": "application/javascript",
+    ".css": "text/css",
+}
+
+# href="styles.css?v=..." / src="calendar.js?v=..." in the panel page
+ASSET_REFERENCE = re.compile(r'(?P<attr>href|src)="(?P<name>[\w.-]+\.(?:js|css))(?:\?[^"]*)?"')
+SCRIPT_TAG = re.compile(r'<script src="(?P<name>[\w.-]+\.js)(?:\?[^"]*)?"></script>')
+STYLESHEET_TAG = re.compile(r'<link rel="stylesheet" href="(?P<name>[\w.-]+\.css)(?:\?[^"]*)?">')
+
+IDENTIFIER_CHARS = frozenset(
+    "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789_$"
+)
+# A "/" after one of these starts a regular expression, not a division
+REGEX_PRECEDERS = frozenset("(,=:[!&|?{};+-*%<>~^")
+REGEX_KEYWORDS = frozenset(
+    ("return", "typeof", "case", "do", "else", "in", "of", "new", "delete", "void", "throw", "yield", "await")
+)
+# A "/" right after the ")" closing these statements' parentheses starts a regex
+PAREN_KEYWORDS = frozenset(("if", "for", "while", "with"))
+
+
+def _skip_string(source, i):
+    """Return the index after the quoted string starting at i."""
+    quote = source[i]
+    i += 1
+    while i < len(source):
+        if source[i] == "\\":
+            i += 2
+            continue
+        if source[i] == quote:
+            return i + 1
+        i += 1
+    return i
+
+
+def _skip_expression(source, i):
+    """Return the index after the "}" closing a template ${ expression at i."""
+    depth = 0
+    while i < len(source):
+        char = source[i]
+        if char in "'\"":
+            i = _skip_string(source, i)
+            continue
+        if char == "`":
+            i = _skip_template(source, i)
+            continue
+        if char == "{":
+            depth += 1
+        elif char == "}":
+            if depth == 0:
+                return i + 1
+            depth -= 1
+        i += 1
+    return i
+
+
+def _skip_template(source, i):
+    """Return the index after the template literal starting at i."""
+    i += 1
+    while i < len(source):
+        char = source[i]
+        if char == "\\":
+            i += 2
+            continue
+        if char == "`":
+            return i + 1
+        if char == "$" and source[i + 1:i + 2] == "{":
+            i = _skip_expression(source, i + 2)
+            continue
+        i += 1
+    return i
+
+
+def _skip_regex(source, i):
+    """Return the index after the regular expression literal starting at i."""
+    i += 1
+    in_class = False
+    while i < len(source):
+        char = source[i]
+        if char == "\\":
+            i += 2
+            continue
+        if char == "[":
+            in_class = True
+        elif char == "]":
+            in_class = False
+        elif char == "/" and not in_class:
+            i += 1
+            break
+        elif char == "\n":
+            break
+        i += 1
+    while i < len(source) and source[i] in IDENTIFIER_CHARS:
+        i += 1
+    return i
+
+
+def _last_word(out):
+    """Return the identifier or keyword the emitted output ends with, if any."""
+    match = re.search(r"[\w$]+$", "".join(out[-20:]).rstrip())
+    return match.group(0) if match else ""
+
+
+def _starts_regex(out, keyword_paren):
+    """Return True if a "/" following the emitted output starts a regex.
+
+    ``keyword_paren`` tells whether the last ")" closed the condition of
+    an if, for, while or with, so the "/" starts the statement it guards.
+    """
+    text = "".join(out[-3:]).rstrip()
+    if not text:
+        return True
+    if text[-1] == ")":
+        return keyword_paren
+    if text.endswith(("++", "--")):
+        # Postfix, as in i++ / 2
+        return False
+    if text[-1] in REGEX_PRECEDERS:
+        return True
+    if text[-1] in IDENTIFIER_CHARS:
+        return _last_word(out) in REGEX_KEYWORDS
+    return False
+
+
+def minify_js(source):
+    """Strip comments, indentation, trailing whitespace and blank lines from JavaScript.
+
+    Nothing else changes: whitespace within a line, strings, template
+    literals and regular expressions are copied verbatim, and line breaks
+    are kept so automatic semicolon insertion behaves exactly as in the
+    source. Telling a regex from a division only matters for finding
+    comments, so a wrong guess cannot alter code.
+    """
+    out = []
+    pending = None  # None, the whitespace within a line, or "\n"
+    parens = []  # for each open "(", whether it follows if/for/while/with
+    keyword_paren = False
+    i = 0
+    length = len(source)
+
+    def emit(token):
+        """Append a token after the whitespace that precedes it."""
+        nonlocal pending
+        if pending and out:
+            out.append(pending)
+        pending = None
+        out.append(token)
+
+    while i < length:
+        char = source[i]
+        if char in " \t\r\n":
+            start = i
+            while i < length and source[i] in " \t\r\n":
+                i += 1
+            if "\n" in source[start:i] or pending == "\n":
+                pending = "\n"
+            else:
+                pending = source[start:i]
+            continue
+
+        if char == "/" and source[i + 1:i + 2] == "/":
+            end = source.find("\n", i)
+            i = length if end == -1 else end
+            continue
+
+        if char == "/" and source[i + 1:i + 2] == "*":
+            end = source.find("*/", i + 2)
+            end = length if end == -1 else end + 2
+            # A comment separates tokens like whitespace does
+            if "\n" in source[i:end] or pending == "\n":
+                pending = "\n"
+            elif not pending:
+                pending = " "
+            i = end
+            continue
+
+        if char in "'\"":
+            end = _skip_string(source, i)
+        elif char == "`":
+            end = _skip_template(source, i)
+        elif char == "/" and _starts_regex(out, keyword_paren):
+            end = _skip_regex(source, i)
+        else:
+            end = i + 1
+            if char == "(":
+                parens.append(_last_word(out) in PAREN_KEYWORDS)
+            elif char == ")":
+                keyword_paren = parens.pop() if parens else False
+        emit(source[i:end])
+        i = end
+
+    return "".join(out).strip() + "\n"
+
+
+def minify_css(source):
+    """Strip comments and redundant whitespace from CSS."""
+    source = re.sub(r"/\*.*?\*/", "", source, flags=re.S)
+    source = re.sub(r"\s+", " ", source)
+    source = re.sub(r"\s*([{};,>])\s*", r"\1", source)
+    # Only after a colon: a space before one is a descendant selector
+    source = re.sub(r":\s+", ":", source)
+    return source.replace(";}", "}").strip()
+
+
+def split_critical_css(source):
+    """Split a stylesheet into (critical, rest) at the CRITICAL_CSS_END marker."""
+    critical, marker, rest = source.partition(CRITICAL_CSS_END)
+    if not marker:
+        return source, ""
+    return critical, rest
+
+
+@dataclass
+class Asset:
+    """One frontend file with its content hash and compressed variants."""
+
+    name: str
+    body: bytes
+    content_type: str
+    digest: str
+    url_prefix: str = ""
+    encodings: dict = field(default_factory=dict)
+
+    @classmethod
+    def from_bytes(cls, name, body, url_prefix=""):
+        """Hash and precompress a file's contents."""
+        asset = cls(
+            name=name,
+            body=body,
+            content_type=CONTENT_TYPES[os.path.splitext(name)[1]],
+            digest=hashlib.sha256(body).hexdigest()[:16],
+            url_prefix=url_prefix,
+        )
+        if brotli is not None:
+            asset.encodings["br"] = brotli.compress(body, quality=11)
+        asset.encodings["gzip"] = gzip.compress(body, compresslevel=9, mtime=0)
+        return asset
+
+    @property
+    def url(self):
+        """Return the content-addressed URL of the asset."""
+        return f"{self.url_prefix}/{self.digest}/{self.name}"
+
+    def negotiate(self, accept_encoding):
+        """Return (body, content_encoding) for an Accept-Encoding header."""
+        accepted = {
+            value.split(";")[0].strip() for value in (accept_encoding or "").split(",")
+        }
+        for encoding in ("br", "gzip"):
+            if encoding in accepted and encoding in self.encodings:
+                return self.encodings[encoding], encoding
+        return self.body, None
+
+
+def _read(www_path, name):
+    """Read a frontend file as text."""
+    with open(os.path.join(www_path, name), encoding="utf-8") as frontend_file:
+        return frontend_file.read()
+
+
+def _build_raw(www_path, html, url_prefix):
+    """Hash and compress the files the page references, unchanged."""
+    assets = {}
+    for match in ASSET_REFERENCE.finditer(html):
+        name = match.group("name")
+        if name not in assets:
+            assets[name] = Asset.from_bytes(name, _read(www_path, name).encode("utf-8"), url_prefix)
+
+    def rewrite(match):
+        """Point a reference to a known asset at its hashed URL."""
+        asset = assets.get(match.group("name"))
+        if asset is None:
+            return match.group(0)
+        return f'{match.group("attr")}="{asset.url}"'
+
+    return ASSET_REFERENCE.sub(rewrite, html), assets
+
+
+def _build_bundle(www_path, html, url_prefix):
+    """Bundle and minify the page's scripts and stylesheets.
+
+    The scripts become one bundle.js in page order. The critical part of the
+    stylesheets is inlined into the page and the rest becomes bundle.css,
+    loaded without blocking the first paint.
+    """
+    scripts = [match.group("name") for match in SCRIPT_TAG.finditer(html)]
+    stylesheets = [match.group("name") for match in STYLESHEET_TAG.finditer(html)]
+
+    # The scripts are classic scripts sharing one global scope
+    bundle_js = ";\n".join(minify_js(_read(www_path, name)) for name in scripts)
+    critical_parts, rest_parts = [], []
+    for name in stylesheets:
+        critical, rest = split_critical_css(_read(www_path, name))
+        critical_parts.append(minify_css(critical))
+        rest_parts.append(minify_css(rest))
+
+    assets = {}
+    if scripts:
+        assets[BUNDLE_JS] = Asset.from_bytes(BUNDLE_JS, bundle_js.encode("utf-8"), url_prefix)
+    if any(rest_parts):
+        assets[BUNDLE_CSS] = Asset.from_bytes(BUNDLE_CSS, "".join(rest_parts).encode("utf-8"), url_prefix)
+
+    # Replace the last script tag by the bundle so inline scripts after it still work
+    script_tags = list(SCRIPT_TAG.finditer(html))
+    for index, match in reversed(list(enumerate(script_tags))):
+        replacement = ""
+        if index == len(script_tags) - 1:
+            replacement = f'<script src="{assets[BUNDLE_JS].url}"></script>'
+        html = html[:match.start()] + replacement + html[match.end():]
+
+    stylesheet_tags = list(STYLESHEET_TAG.finditer(html))
+    for index, match in reversed(list(enumerate(stylesheet_tags))):
+        replacement = ""
+        if index == 0:
+            replacement = f"<style>{''.join(critical_parts)}</style>"
+            if BUNDLE_CSS in assets:
+                url = assets[BUNDLE_CSS].url
+                replacement += (
+                    f'<link rel="stylesheet" href="{url}" media="print" onload="this.media=\'all\'">'
+                    f'<noscript><link rel="stylesheet" href="{url}"></noscript>'
+                )
+        html = html[:match.start()] + replacement + html[match.end():]
+
+    return html, assets
+
+
+def build_assets(www_path, url_prefix, debug=False):
+    """Build the panel page and its assets.
+
+    Returns (panel, assets by name). In production the scripts and styles
+    are bundled and minified; with debug the original files are served so
+    they are readable in the browser's developer tools. Either way asset
+    references in the page point to content-addressed URLs, so a changed
+    file gets a new URL and everything else can be cached forever.
+    """
+    html = _read(www_path, PANEL_FILE)
+    if debug:
+        html, assets = _build_raw(www_path, html, url_prefix)
+    else:
+        html, assets = _build_bundle(www_path, html, url_prefix)
+    return Asset.from_bytes(PANEL_FILE, html.encode("utf-8"), url_prefix), assets
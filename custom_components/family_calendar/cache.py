@@ -0,0 +1,92 @@
+"""In-process event cache for Family Calendar."""
+import logging
+import time
+from collections import OrderedDict
+
+from .const import DEFAULT_CACHE_MAX_ENTRIES, DEFAULT_CACHE_TTL
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class EventCache:
+    """LRU cache of calendar events keyed by (calendar entity, window).
+
+    Entries expire after ``ttl`` seconds and the least recently used entry is
+    evicted once ``max_entries`` is reached. Expired entries are kept until
+    they are evicted so they can still be served stale. Writes to a calendar
+    should call ``invalidate`` so the next read goes upstream again.
+    """
+
+    def __init__(self, ttl=DEFAULT_CACHE_TTL, max_entries=DEFAULT_CACHE_MAX_ENTRIES):
+        """Initialize the cache."""
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+
+    @staticmethod
+    def make_key(calendar_entity, start_dt, end_dt):
+        """Build the cache key for a calendar and window."""
+        return (calendar_entity, start_dt.isoformat(), end_dt.isoformat())
+
+    def _get_entry(self, key, allow_expired=False):
+        """Return the live entry for key, or an expired one if allowed."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        if self.ttl <= 0 or time.monotonic() - entry[0] > self.ttl:
+            return entry if allow_expired else None
+
+        self._entries.move_to_end(key)
+        return entry
+
+    def get(self, key):
+        """Return cached events for key, or None if missing or expired."""
+        entry = self._get_entry(key)
+        return entry[1] if entry is not None else None
+
+    def get_serialized(self, key, fmt):
+        """Return the precomputed serialization of a cached entry, if any."""
+        entry = self._get_entry(key)
+        return entry[2].get(fmt) if entry is not None else None
+
+    def get_stale_serialized(self, key, fmt):
+        """Return the serialization of an entry even if it has expired."""
+        entry = self._get_entry(key, allow_expired=True)
+        return entry[2].get(fmt) if entry is not None else None
+
+    def set_serialized(self, key, fmt, events_list):
+        """Remember the serialization of a cached entry in a given format."""
+        entry = self._entries.get(key)
+        if entry is not None:
+            entry[2][fmt] = events_list
+
+    def set(self, key, events, stored_at=None):
+        """Store events for key, evicting the oldest entries if needed.
+
+        ``stored_at`` is the time.monotonic() at which the events were
+        fetched, if earlier than now, so the entry expires with its data.
+        """
+        if self.ttl <= 0:
+            return
+
+        # [stored_at, events, {format: serialized events}]
+        self._entries[key] = [time.monotonic() if stored_at is None else stored_at, events, {}]
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            evicted, _ = self._entries.popitem(last=False)
+            _LOGGER.debug(f"Event cache evicted {evicted}")
+
+    def invalidate(self, calendar_entity=None):
+        """Drop all entries for a calendar, or everything if none is given."""
+        if calendar_entity is None:
+            self._entries.clear()
+            return
+
+        for key in [k for k in self._entries if k[0] == calendar_entity]:
+            self._entries.pop(key, None)
+        _LOGGER.debug(f"Event cache invalidated for {calendar_entity}")
+
+    def __len__(self):
+        """Return the number of cached entries."""
+        return len(self._entries)
@@ -1,6 +1,8 @@
 """Config flow for Family Calendar."""
-import voluptuous as vol
+import logging
 import random
+
+import voluptuous as vol
 from homeassistant.config_entries import ConfigFlow, OptionsFlow
 from homeassistant.data_entry_flow import FlowResult
 from homeassistant.helpers import entity_registry as er
@@ -8,7 +10,32 @@ from homeassistant.helpers import config_validation as cv
 from homeassistant.helpers.selector import selector
 from homeassistant.core import callback
 
-from .const import DOMAIN
+from .const import (
+    CONF_CACHE_TTL,
+    CONF_CALENDARS,
+    CONF_CONSOLIDATE,
+    CONF_DEBUG_FRONTEND,
+    CONF_FETCH_TIMEOUT,
+    CONF_PREFETCH_DEPTH,
+    CONF_TIMING_LOG_RATE,
+    CONF_UPSTREAM_CONCURRENCY,
+    CONF_UPSTREAM_RATE,
+    DEFAULT_CACHE_TTL,
+    DEFAULT_COLOR,
+    DEFAULT_FETCH_TIMEOUT,
+    DEFAULT_PREFETCH_DEPTH,
+    DEFAULT_TIMING_LOG_RATE,
+    DEFAULT_UPSTREAM_LIMITS,
+    DOMAIN,
+    MAX_FETCH_TIMEOUT,
+    MAX_PREFETCH_DEPTH,
+    MAX_UPSTREAM_CONCURRENCY,
+    MAX_UPSTREAM_RATE,
+    UPSTREAM_PLATFORMS,
+)
+from .runtime import entry_calendars, settings_entry
+
+_LOGGER = logging.getLogger(__name__)
 
 # Color palette for random selection - brighter colors
 COLOR_PALETTE = [
@@ -29,6 +56,75 @@ COLOR_PALETTE = [
     "#90A4AE",  # Light Blue Grey
 ]
 
+def _color_to_hex(color, default=DEFAULT_COLOR):
+    """Convert a color picker RGB list to hex."""
+    if isinstance(color, list) and len(color) == 3:
+        return "#{:02x}{:02x}{:02x}".format(color[0], color[1], color[2])
+    return color or default
+
+
+def _color_to_rgb(color):
+    """Convert a hex color to an RGB list for the color picker."""
+    if color and color.startswith("#") and len(color) == 7:
+        try:
+            return [int(color[1:3], 16), int(color[3:5], 16), int(color[5:7], 16)]
+        except ValueError:
+            pass
+    return [33, 150, 243]  # Default blue
+
+
+def _upstream_keys():
+    """Return the option keys of the per-platform upstream limits."""
+    return [
+        f"{platform}_{suffix}"
+        for platform in UPSTREAM_PLATFORMS
+        for suffix in (CONF_UPSTREAM_CONCURRENCY, CONF_UPSTREAM_RATE)
+    ]
+
+
+def _settings_keys():
+    """Return the option keys of the global settings."""
+    return [
+        CONF_CACHE_TTL,
+        CONF_PREFETCH_DEPTH,
+        CONF_FETCH_TIMEOUT,
+        CONF_DEBUG_FRONTEND,
+        CONF_TIMING_LOG_RATE,
+    ] + _upstream_keys()
+
+
+def _settings_schema(data):
+    """Return the schema fields of the global settings."""
+    schema = {
+        vol.Optional(
+            CONF_CACHE_TTL, default=data.get(CONF_CACHE_TTL, DEFAULT_CACHE_TTL)
+        ): vol.All(vol.Coerce(int), vol.Range(min=0, max=3600)),
+        vol.Optional(
+            CONF_PREFETCH_DEPTH, default=data.get(CONF_PREFETCH_DEPTH, DEFAULT_PREFETCH_DEPTH)
+        ): vol.All(vol.Coerce(int), vol.Range(min=0, max=MAX_PREFETCH_DEPTH)),
+        vol.Optional(
+            CONF_FETCH_TIMEOUT, default=data.get(CONF_FETCH_TIMEOUT, DEFAULT_FETCH_TIMEOUT)
+        ): vol.All(vol.Coerce(float), vol.Range(min=0, max=MAX_FETCH_TIMEOUT)),
+        vol.Optional(
+            CONF_DEBUG_FRONTEND, default=data.get(CONF_DEBUG_FRONTEND, False)
+        ): bool,
+        vol.Optional(
+            CONF_TIMING_LOG_RATE, default=data.get(CONF_TIMING_LOG_RATE, DEFAULT_TIMING_LOG_RATE)
+        ): vol.All(vol.Coerce(float), vol.Range(min=0, max=1)),
+    }
+    for platform in UPSTREAM_PLATFORMS:
+        concurrency_key = f"{platform}_{CONF_UPSTREAM_CONCURRENCY}"
+        rate_key = f"{platform}_{CONF_UPSTREAM_RATE}"
+        concurrency, rate = DEFAULT_UPSTREAM_LIMITS[platform]
+        schema[vol.Optional(concurrency_key, default=data.get(concurrency_key, concurrency))] = vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=MAX_UPSTREAM_CONCURRENCY)
+        )
+        schema[vol.Optional(rate_key, default=data.get(rate_key, rate))] = vol.All(
+            vol.Coerce(float), vol.Range(min=0, max=MAX_UPSTREAM_RATE)
+        )
+    return schema
+
+
 class FamilyCalendarConfigFlow(ConfigFlow, domain=DOMAIN):
     """Family Calendar config flow."""
     
@@ -51,6 +147,22 @@ class FamilyCalendarConfigFlow(ConfigFlow, domain=DOMAIN):
             elif not color:
                 user_input["color"] = random.choice(COLOR_PALETTE)
             
+            # With a consolidated entry, new calendars are added to it
+            for entry in self.hass.config_entries.async_entries(DOMAIN):
+                if CONF_CALENDARS in entry.data:
+                    new_data = dict(entry.data)
+                    new_data[CONF_CALENDARS] = {
+                        **entry.data[CONF_CALENDARS],
+                        user_input["calendar_entity"]: {
+                            "color": user_input["color"],
+                            "name": user_input.get("name", ""),
+                        },
+                    }
+                    if user_input.get("weather_entity"):
+                        new_data["weather_entity"] = user_input["weather_entity"]
+                    self.hass.config_entries.async_update_entry(entry, data=new_data)
+                    return self.async_abort(reason="calendar_added")
+            
             return self.async_create_entry(
                 title=f"Calendar: {user_input.get('calendar_entity', 'Unknown')}", 
                 data=user_input
@@ -99,17 +211,21 @@ class FamilyCalendarOptionsFlow(OptionsFlow):
     def __init__(self, config_entry):
         """Initialize options flow."""
         self.config_entry = config_entry
+        self._data = None
+
+    def _is_settings_entry(self):
+        """Return True if this entry's global settings are the ones applied."""
+        entry = settings_entry(self.hass.config_entries.async_entries(DOMAIN))
+        return entry is not None and entry.entry_id == self.config_entry.entry_id
 
     async def async_step_init(self, user_input=None):
         """Manage the options."""
+        if CONF_CALENDARS in self.config_entry.data:
+            return await self.async_step_consolidated(user_input)
+
         if user_input is not None:
             try:
-                # Convert RGB list to hex if needed
-                color = user_input.get("color")
-                if isinstance(color, list) and len(color) == 3:
-                    color = "#{:02x}{:02x}{:02x}".format(color[0], color[1], color[2])
-                elif not color:
-                    color = "#2196f3"
+                color = _color_to_hex(user_input.get("color"))
                 
                 # Update the config entry data with new color
                 new_data = dict(self.config_entry.data)
@@ -131,54 +247,47 @@ class FamilyCalendarOptionsFlow(OptionsFlow):
                     # Remove weather entity if cleared
                     new_data.pop("weather_entity", None)
                 
-                # Update the config entry
-                self.hass.config_entries.async_update_entry(
-                    self.config_entry, data=new_data
-                )
+                if self._is_settings_entry():
+                    # Update event cache TTL, prefetch depth, upstream time budget, frontend debug mode
+                    # and timing log rate
+                    new_data[CONF_CACHE_TTL] = user_input.get(CONF_CACHE_TTL, DEFAULT_CACHE_TTL)
+                    new_data[CONF_PREFETCH_DEPTH] = user_input.get(
+                        CONF_PREFETCH_DEPTH, DEFAULT_PREFETCH_DEPTH
+                    )
+                    new_data[CONF_FETCH_TIMEOUT] = user_input.get(
+                        CONF_FETCH_TIMEOUT, DEFAULT_FETCH_TIMEOUT
+                    )
+                    new_data[CONF_DEBUG_FRONTEND] = user_input.get(CONF_DEBUG_FRONTEND, False)
+                    new_data[CONF_TIMING_LOG_RATE] = user_input.get(
+                        CONF_TIMING_LOG_RATE, DEFAULT_TIMING_LOG_RATE
+                    )
+                    # Upstream concurrency and rate limits per platform
+                    for key in _upstream_keys():
+                        if key in user_input:
+                            new_data[key] = user_input[key]
                 
-                # Update the runtime data in hass.data
-                calendar_entity = self.config_entry.data.get("calendar_entity")
-                if calendar_entity and DOMAIN in self.hass.data:
-                    if "colors" not in self.hass.data[DOMAIN]:
-                        self.hass.data[DOMAIN]["colors"] = {}
-                    self.hass.data[DOMAIN]["colors"][calendar_entity] = color
-                    
-                    if "names" not in self.hass.data[DOMAIN]:
-                        self.hass.data[DOMAIN]["names"] = {}
-                    if name:
-                        self.hass.data[DOMAIN]["names"][calendar_entity] = name
-                    elif calendar_entity in self.hass.data[DOMAIN]["names"]:
-                        self.hass.data[DOMAIN]["names"].pop(calendar_entity, None)
-                    
-                    if weather:
-                        self.hass.data[DOMAIN]["weather_entity"] = weather
+                if user_input.get(CONF_CONSOLIDATE):
+                    await self._async_consolidate(new_data)
+                else:
+                    # The entry's update listener refreshes the runtime data
+                    self.hass.config_entries.async_update_entry(
+                        self.config_entry, data=new_data
+                    )
                 
                 # Return with empty data for options (data is stored in config entry data)
                 return self.async_create_entry(title="", data={})
             except Exception as err:
-                import logging
-                _LOGGER = logging.getLogger(__name__)
                 _LOGGER.error(f"Error updating config: {err}", exc_info=True)
                 return self.async_abort(reason="unknown")
 
         try:
-            current_color = self.config_entry.data.get("color", "#2196f3")
             current_name = self.config_entry.data.get("name", "")
             current_weather = self.config_entry.data.get("weather_entity", "")
-            
-            # Convert hex to RGB for the color picker
-            if current_color and current_color.startswith("#") and len(current_color) == 7:
-                try:
-                    r = int(current_color[1:3], 16)
-                    g = int(current_color[3:5], 16)
-                    b = int(current_color[5:7], 16)
-                    current_color_rgb = [r, g, b]
-                except (ValueError, IndexError):
-                    current_color_rgb = [33, 150, 243]  # Default blue
-            else:
-                current_color_rgb = [33, 150, 243]  # Default blue
+            current_color_rgb = _color_to_rgb(self.config_entry.data.get("color", DEFAULT_COLOR))
             
             calendar_entity = self.config_entry.data.get("calendar_entity", "Unknown")
+            # The global settings only take effect on one entry, offer them there
+            settings = _settings_schema(self.config_entry.data) if self._is_settings_entry() else {}
 
             return self.async_show_form(
                 step_id="init",
@@ -190,13 +299,105 @@ class FamilyCalendarOptionsFlow(OptionsFlow):
                     vol.Optional("color", default=current_color_rgb): selector({
                         "color_rgb": {}
                     }),
+                    **settings,
+                    # Merge all per-calendar entries into this one
+                    vol.Optional(CONF_CONSOLIDATE, default=False): bool,
                 }),
                 description_placeholders={
                     "calendar": calendar_entity,
                 },
             )
         except Exception as err:
-            import logging
-            _LOGGER = logging.getLogger(__name__)
             _LOGGER.error(f"Error showing form: {err}", exc_info=True)
             return self.async_abort(reason="unknown")
+
+    async def _async_consolidate(self, new_data):
+        """Turn this entry into one entry for all calendars.
+
+        The calendars of the other per-calendar entries are merged into this
+        entry, and those entries are removed.
+        """
+        other_entries = [
+            entry
+            for entry in self.hass.config_entries.async_entries(DOMAIN)
+            if entry.entry_id != self.config_entry.entry_id and CONF_CALENDARS not in entry.data
+        ]
+
+        # Keep the settings in effect, which may come from another entry
+        settings = new_data
+        if not self._is_settings_entry():
+            settings = settings_entry(self.hass.config_entries.async_entries(DOMAIN)).data
+
+        calendars = {}
+        weather_entity = None
+        for entry_data in [e.data for e in other_entries] + [new_data]:
+            for calendar in entry_calendars(entry_data):
+                calendars[calendar.entity_id] = {"color": calendar.color, "name": calendar.name or ""}
+            weather_entity = entry_data.get("weather_entity") or weather_entity
+
+        data = {key: settings[key] for key in _settings_keys() if key in settings}
+        data[CONF_CALENDARS] = calendars
+        if weather_entity:
+            data["weather_entity"] = weather_entity
+
+        self.hass.config_entries.async_update_entry(
+            self.config_entry, title="Family Calendar", data=data
+        )
+        for entry in other_entries:
+            await self.hass.config_entries.async_remove(entry.entry_id)
+
+    async def async_step_consolidated(self, user_input=None):
+        """Choose the calendars, weather entity and settings of a consolidated entry."""
+        data = self.config_entry.data
+        if user_input is not None:
+            self._data = {
+                key: value
+                for key, value in user_input.items()
+                if key not in (CONF_CALENDARS, "weather_entity")
+            }
+            if user_input.get("weather_entity"):
+                self._data["weather_entity"] = user_input["weather_entity"]
+            self._data[CONF_CALENDARS] = {
+                entity_id: data[CONF_CALENDARS].get(entity_id, {"color": DEFAULT_COLOR, "name": ""})
+                for entity_id in user_input.get(CONF_CALENDARS, [])
+            }
+            return await self.async_step_calendars()
+
+        return self.async_show_form(
+            step_id="consolidated",
+            data_schema=vol.Schema({
+                vol.Optional(CONF_CALENDARS, default=list(data[CONF_CALENDARS])): selector({
+                    "entity": {"domain": "calendar", "multiple": True}
+                }),
+                vol.Optional("weather_entity", default=data.get("weather_entity", "")): selector({
+                    "entity": {"domain": "weather", "multiple": False}
+                }),
+                **_settings_schema(data),
+            }),
+        )
+
+    async def async_step_calendars(self, user_input=None):
+        """Set the name and color of each calendar of a consolidated entry."""
+        calendars = self._data[CONF_CALENDARS]
+        if user_input is not None:
+            for index, entity_id in enumerate(calendars):
+                calendars[entity_id] = {
+                    "color": _color_to_hex(user_input.get(f"color_{index}")),
+                    "name": user_input.get(f"name_{index}", ""),
+                }
+            # The entry's update listener refreshes the runtime data
+            self.hass.config_entries.async_update_entry(self.config_entry, data=self._data)
+            return self.async_create_entry(title="", data={})
+
+        schema = {}
+        for index, (entity_id, settings) in enumerate(calendars.items()):
+            schema[vol.Optional(f"name_{index}", default=settings.get("name", ""))] = str
+            schema[vol.Optional(f"color_{index}", default=_color_to_rgb(settings.get("color")))] = selector({
+                "color_rgb": {}
+            })
+
+        return self.async_show_form(
+            step_id="calendars",
+            data_schema=vol.Schema(schema),
+            description_placeholders={"calendars": ", ".join(calendars)},
+        )
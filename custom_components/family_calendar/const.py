@@ -1,2 +1,70 @@
 """Constants for Family Calendar."""
 DOMAIN = "family_calendar"
+
+# Server-side event cache
+CONF_CACHE_TTL = "cache_ttl"
+DEFAULT_CACHE_TTL = 60  # seconds
+DEFAULT_CACHE_MAX_ENTRIES = 256
+DEFAULT_STORE_MAX_EVENTS = 20000  # events held across all calendars
+
+# Incremental sync
+DEFAULT_SYNC_MAX_SNAPSHOTS = 512
+
+# Push updates
+SIGNAL_CALENDAR_UPDATED = f"{DOMAIN}_calendar_updated"
+PUSH_REFRESH_INTERVAL = 300  # seconds
+
+# Weather forecast cache
+WEATHER_REFRESH_INTERVAL = 1800  # seconds
+
+# Bulk writes
+DEFAULT_WRITE_CONCURRENCY = 2  # per calendar
+MAX_BATCH_OPERATIONS = 100  # per request or service call
+
+# Prefetch of adjacent windows
+CONF_PREFETCH_DEPTH = "prefetch_depth"
+DEFAULT_PREFETCH_DEPTH = 0  # disabled
+MAX_PREFETCH_DEPTH = 4
+PREFETCH_DELAY = 1  # seconds after the foreground request
+
+# Persistent event snapshot for cold starts
+SNAPSHOT_STORAGE_KEY = f"{DOMAIN}.snapshot"
+SNAPSHOT_STORAGE_VERSION = 1
+SNAPSHOT_SAVE_DELAY = 60  # seconds
+DEFAULT_SNAPSHOT_MAX_WINDOWS = 128
+
+# Per-calendar upstream time budget before serving stale events
+CONF_FETCH_TIMEOUT = "fetch_timeout"
+DEFAULT_FETCH_TIMEOUT = 5  # seconds, 0 = wait for the provider
+MAX_FETCH_TIMEOUT = 60
+
+# Config entries: one per calendar (legacy) or one for all calendars
+CONF_CALENDARS = "calendars"
+CONF_CONSOLIDATE = "consolidate"
+DEFAULT_COLOR = "#2196f3"
+
+# Frontend assets
+STATIC_URL = "/family_calendar_static"
+ASSETS_URL = "/family_calendar_assets"
+CONF_DEBUG_FRONTEND = "debug_frontend"
+
+# Upstream calls per calendar platform: (concurrency, calls per second, 0 = unlimited)
+# Options are named "<platform>_concurrency" and "<platform>_rate"
+CONF_UPSTREAM_CONCURRENCY = "concurrency"
+CONF_UPSTREAM_RATE = "rate"
+UPSTREAM_PLATFORMS = ("google", "caldav", "local")
+DEFAULT_UPSTREAM_LIMITS = {
+    "google": (4, 5.0),
+    "caldav": (4, 0),
+    "local": (8, 0),
+}
+DEFAULT_UPSTREAM_LIMIT = (4, 0)  # other platforms
+MAX_UPSTREAM_CONCURRENCY = 16
+MAX_UPSTREAM_RATE = 50
+
+# Server-Timing of the views and sampled timing log
+CONF_TIMING_LOG_RATE = "timing_log_rate"
+DEFAULT_TIMING_LOG_RATE = 0  # share of requests, 0 = off
+
+# Latency histogram bounds in seconds
+METRICS_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
@@ -0,0 +1,25 @@
+"""Diagnostics support for Family Calendar."""
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .runtime import get_runtime
+
+
+async def async_get_config_entry_diagnostics(hass: HomeAssistant, entry: ConfigEntry) -> dict:
+    """Return the entry's settings with the integration's metrics and cache state.
+
+    Metrics are shared by all entries, since the caches and views are.
+    """
+    runtime = get_runtime(hass)
+    return {
+        "entry": dict(entry.data),
+        "metrics": runtime.metrics.as_dict(),
+        "event_cache": {"ttl": runtime.event_cache.ttl, "entries": len(runtime.event_cache)},
+        "event_store": {"held_ranges": len(runtime.event_store)},
+        "snapshot": {"windows": len(runtime.snapshot)},
+        "in_flight_fetches": len(runtime.in_flight),
+        "upstream_limits": {
+            platform: {"concurrency": concurrency, "rate": rate}
+            for platform, (concurrency, rate) in runtime.scheduler.limits.items()
+        },
+    }
@@ -0,0 +1,409 @@
+"""Event fetching helpers shared by the Family Calendar views."""
+import asyncio
+import logging
+import time
+from datetime import datetime
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.util import dt as dt_util
+
+from .cache import EventCache
+from .const import SIGNAL_CALENDAR_UPDATED
+from .runtime import get_runtime
+from .scheduler import PRIORITY_BACKGROUND, PRIORITY_INTERACTIVE, QueueTicket
+from .serialization import FORMAT_FULL, SERIALIZERS
+from .store import event_identity
+from .timing import phase
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def sync_events(
+    hass: HomeAssistant, calendar_entity, start_dt, end_dt, events_list, since_tokens=(), fmt=FORMAT_FULL
+):
+    """Return an incremental sync payload for serialized events."""
+    scope = EventCache.make_key(calendar_entity, start_dt, end_dt) + (fmt,)
+    return get_runtime(hass).sync_tracker.sync(scope, events_list, since_tokens)
+
+
+def invalidate_calendar(hass: HomeAssistant, calendar_entity):
+    """Drop cached events after a write and notify push subscribers."""
+    runtime = get_runtime(hass)
+    runtime.generations[calendar_entity] = runtime.generations.get(calendar_entity, 0) + 1
+    runtime.event_cache.invalidate(calendar_entity)
+    runtime.event_store.invalidate(calendar_entity)
+    # Requests after the write must not join a fetch started before it
+    for key in [key for key in runtime.in_flight if key[0] == calendar_entity]:
+        del runtime.in_flight[key]
+    for key in [key for key in runtime.refresh_tasks if key[0] == calendar_entity]:
+        del runtime.refresh_tasks[key]
+    runtime.snapshot.invalidate(calendar_entity)
+    async_dispatcher_send(hass, SIGNAL_CALENDAR_UPDATED, calendar_entity)
+
+
+def parse_window(start, end):
+    """Parse the ISO start/end query parameters into datetimes."""
+    start_dt = datetime.fromisoformat(start.replace('Z', '+00:00'))
+    end_dt = datetime.fromisoformat(end.replace('Z', '+00:00'))
+    return start_dt, end_dt
+
+
+def _as_local(value):
+    """Return an aware datetime in Home Assistant's time zone."""
+    if value.tzinfo is None:
+        return value.replace(tzinfo=dt_util.DEFAULT_TIME_ZONE)
+    return value.astimezone(dt_util.DEFAULT_TIME_ZONE)
+
+
+async def _async_fetch_upstream(
+    hass: HomeAssistant, key, resolved, start_dt, end_dt, ticket, generation
+):
+    """Fetch a window from the provider and hold the events in the store.
+
+    The call is queued with ``ticket``, which requests joining the flight
+    may raise. ``generation`` is the calendar's write generation when the
+    flight was started. It is taken before the task exists, since Home
+    Assistant may run the task eagerly and finish it before the caller has
+    registered it.
+    """
+    runtime = get_runtime(hass)
+    async with runtime.scheduler.slot(resolved.platform, ticket=ticket):
+        _LOGGER.debug(f"Calling async_get_events on {key[0]} from {start_dt} to {end_dt}")
+        metrics = runtime.metrics
+        started = time.perf_counter()
+        try:
+            with phase("upstream"):
+                events = await resolved.entity.async_get_events(hass, start_dt, end_dt)
+        except Exception:
+            metrics.inc("upstream_requests_total", calendar=key[0], result="error")
+            raise
+        finally:
+            metrics.observe("upstream_duration_seconds", time.perf_counter() - started, calendar=key[0])
+        metrics.inc("upstream_requests_total", calendar=key[0], result="ok")
+    # A write during the fetch replaced this flight, its events may be outdated
+    if runtime.generations.get(key[0], 0) == generation:
+        runtime.event_store.add(key[0], start_dt, end_dt, events)
+    return events
+
+
+@callback
+def _async_shared_fetch(hass: HomeAssistant, resolved, start_dt, end_dt, priority):
+    """Return the in-flight upstream fetch of a window, starting one if none runs.
+
+    Identical concurrent requests, such as several dashboards refreshing on
+    the same minute, share one provider call. Callers await it through
+    asyncio.shield, so a cancelled request does not cancel the fetch the
+    others wait for; a fetch nobody waits for anymore still fills the store.
+    A request joining a fetch that is still queued moves it up to its own
+    priority, so it never waits behind background work.
+    """
+    calendar_entity = resolved.entity_id
+    runtime = get_runtime(hass)
+    in_flight = runtime.in_flight
+    key = EventCache.make_key(calendar_entity, start_dt, end_dt)
+    flight = in_flight.get(key)
+    if flight is not None:
+        task, ticket = flight
+        _LOGGER.debug(f"Joining the in-flight fetch of {calendar_entity}")
+        ticket.raise_to(priority)
+        runtime.metrics.inc("coalesced_fetches_total", calendar=calendar_entity)
+        return task
+
+    ticket = QueueTicket(priority)
+    generation = runtime.generations.get(calendar_entity, 0)
+    task = hass.async_create_background_task(
+        _async_fetch_upstream(hass, key, resolved, start_dt, end_dt, ticket, generation),
+        f"family_calendar fetch {calendar_entity}",
+    )
+    in_flight[key] = (task, ticket)
+
+    @callback
+    def async_done(task):
+        """Forget the flight and retrieve an exception nobody awaited."""
+        if key in in_flight and in_flight[key][0] is task:
+            del in_flight[key]
+        if not task.cancelled():
+            task.exception()
+
+    task.add_done_callback(async_done)
+    return task
+
+
+async def _async_fetch_from_store(hass: HomeAssistant, resolved, start_dt, end_dt, priority):
+    """Return (events, fetched_at) for a window, fetching only what the store lacks.
+
+    Week, month and agenda windows overlap, so the ranges already fetched
+    for a calendar are held in the event store and any window is sliced out
+    of them. Only the gaps no held range covers go upstream. ``fetched_at``
+    is when the oldest held range used was fetched, None if all is new.
+    """
+    calendar_entity = resolved.entity_id
+    runtime = get_runtime(hass)
+    event_store = runtime.event_store
+    window_start = _as_local(start_dt)
+    window_end = _as_local(end_dt)
+    gaps = event_store.gaps(calendar_entity, window_start, window_end)
+    if not gaps:
+        result = "hit"
+    elif gaps == [(window_start, window_end)]:
+        result = "miss"
+    else:
+        result = "partial"
+    runtime.metrics.inc("cache_lookups_total", calendar=calendar_entity, layer="store", result=result)
+    if result == "miss":
+        held, fetched_at = [], None
+    else:
+        with phase("store"):
+            held, fetched_at = event_store.slice(calendar_entity, window_start, window_end)
+    if not gaps:
+        return held, fetched_at
+
+    # Includes waiting for a shared fetch another request started
+    with phase("fetch"):
+        fetched = await asyncio.gather(
+            *(
+                asyncio.shield(_async_shared_fetch(hass, resolved, gap_start, gap_end, priority))
+                for gap_start, gap_end in gaps
+            )
+        )
+
+    seen = set()
+    events = []
+    for event in held + [event for gap_events in fetched for event in gap_events]:
+        if event.end_datetime_local <= window_start or event.start_datetime_local >= window_end:
+            continue
+        identity = event_identity(event)
+        if identity not in seen:
+            seen.add(identity)
+            events.append(event)
+
+    events.sort(key=lambda event: event.start_datetime_local)
+    return events, fetched_at
+
+
+async def async_fetch_events(
+    hass: HomeAssistant, calendar_entity, start_dt, end_dt, priority=PRIORITY_INTERACTIVE
+):
+    """Return the events of a calendar in a window, using the event cache.
+
+    Upstream calls are queued with the given scheduler priority. Returns
+    None when the calendar entity cannot be found.
+    """
+    runtime = get_runtime(hass)
+    event_cache = runtime.event_cache
+    cache_key = EventCache.make_key(calendar_entity, start_dt, end_dt)
+    events = event_cache.get(cache_key)
+    generation = runtime.generations.get(calendar_entity, 0)
+    with phase("resolve"):
+        resolved = runtime.resolver.resolve(calendar_entity)
+    if resolved is None:
+        if hass.is_running:
+            # The calendar is gone, don't keep serving its snapshot. During
+            # startup it may just not be loaded yet.
+            runtime.snapshot.invalidate(calendar_entity)
+        return None
+
+    # Counted only once resolved, so unknown ids cannot add metric series
+    if event_cache.ttl > 0:
+        runtime.metrics.inc(
+            "cache_lookups_total",
+            calendar=resolved.entity_id,
+            layer="window",
+            result="miss" if events is None else "hit",
+        )
+    if events is not None:
+        _LOGGER.debug(f"Cache hit for {calendar_entity}")
+        return events
+
+    if event_cache.ttl <= 0:
+        # Caching disabled, fetch exactly the requested window
+        with phase("fetch"):
+            return await asyncio.shield(_async_shared_fetch(hass, resolved, start_dt, end_dt, priority))
+
+    events, fetched_at = await _async_fetch_from_store(hass, resolved, start_dt, end_dt, priority)
+    # A write during the fetch may have changed the calendar, don't keep
+    # events that may predate it
+    if runtime.generations.get(calendar_entity, 0) == generation:
+        # Expire with the oldest held range, not a full TTL from now
+        event_cache.set(cache_key, events, fetched_at)
+    return events
+
+
+async def async_fetch_serialized_events(
+    hass: HomeAssistant, calendar_entity, start_dt, end_dt, fmt=FORMAT_FULL, priority=PRIORITY_INTERACTIVE
+):
+    """Return serialized events of a calendar in a window.
+
+    The serialization is computed once per cache entry and format and reused
+    until the entry expires. Returns None when the calendar cannot be found.
+    """
+    runtime = get_runtime(hass)
+    generation = runtime.generations.get(calendar_entity, 0)
+    events = await async_fetch_events(hass, calendar_entity, start_dt, end_dt, priority)
+    if events is None:
+        return None
+
+    cache_key = EventCache.make_key(calendar_entity, start_dt, end_dt)
+    events_list = runtime.event_cache.get_serialized(cache_key, fmt)
+    if events_list is None:
+        with phase("serialize"):
+            events_list = SERIALIZERS[fmt](events)
+        if runtime.generations.get(calendar_entity, 0) == generation:
+            runtime.event_cache.set_serialized(cache_key, fmt, events_list)
+            runtime.snapshot.update(cache_key, fmt, events_list)
+    return events_list
+
+
+@callback
+def _async_raise_flights(hass: HomeAssistant, calendar_entity, start_dt, end_dt, priority):
+    """Move the queued fetches of a calendar overlapping a window up to a priority."""
+    window_start = _as_local(start_dt)
+    window_end = _as_local(end_dt)
+    for (entity, start, end), (_, ticket) in get_runtime(hass).in_flight.items():
+        if (
+            entity == calendar_entity
+            and _as_local(datetime.fromisoformat(start)) < window_end
+            and _as_local(datetime.fromisoformat(end)) > window_start
+        ):
+            ticket.raise_to(priority)
+
+
+@callback
+def _async_refresh_task(hass: HomeAssistant, calendar_entity, start_dt, end_dt, fmt, priority):
+    """Return the background fetch of a window, starting one if none runs.
+
+    Joining a refresh started with a lower priority raises the priority of
+    the fetches it waits for.
+    """
+    refresh_tasks = get_runtime(hass).refresh_tasks
+    key = EventCache.make_key(calendar_entity, start_dt, end_dt) + (fmt,)
+    task = refresh_tasks.get(key)
+    if task is not None:
+        _async_raise_flights(hass, calendar_entity, start_dt, end_dt, priority)
+    else:
+        task = hass.async_create_background_task(
+            async_fetch_serialized_events(hass, calendar_entity, start_dt, end_dt, fmt, priority),
+            f"family_calendar refresh {calendar_entity}",
+        )
+        refresh_tasks[key] = task
+
+        @callback
+        def async_done(task):
+            """Forget the refresh unless a write already replaced it."""
+            if refresh_tasks.get(key) is task:
+                del refresh_tasks[key]
+
+        task.add_done_callback(async_done)
+    return task
+
+
+@callback
+def _async_notify_when_refreshed(hass: HomeAssistant, calendar_entity, task):
+    """Tell push subscribers once a background fetch brought fresh events."""
+
+    @callback
+    def async_done(task):
+        """Send the calendar update if the fetch worked."""
+        if task.cancelled():
+            return
+        if task.exception() is not None:
+            _LOGGER.warning(f"Background refresh failed for {calendar_entity}: {task.exception()}")
+            return
+        if task.result() is not None:
+            async_dispatcher_send(hass, SIGNAL_CALENDAR_UPDATED, calendar_entity)
+
+    task.add_done_callback(async_done)
+
+
+async def async_get_serialized_events(
+    hass: HomeAssistant, calendar_entity, start_dt, end_dt, fmt=FORMAT_FULL, priority=PRIORITY_INTERACTIVE
+):
+    """Return (events_list, stale) for a calendar in a window.
+
+    Right after a restart, windows held in the persistent snapshot are
+    returned at once with stale=True while the provider is asked in the
+    background. Later, a provider that exceeds the fetch timeout gets the
+    last known events returned with stale=True, and its fetch finishes in
+    the background.
+    """
+    runtime = get_runtime(hass)
+    event_cache = runtime.event_cache
+    cache_key = EventCache.make_key(calendar_entity, start_dt, end_dt)
+    if event_cache.get(cache_key) is not None:
+        events_list = await async_fetch_serialized_events(
+            hass, calendar_entity, start_dt, end_dt, fmt, priority
+        )
+        return events_list, False
+
+    snapshot = runtime.snapshot
+    events_list = snapshot.get_stale(cache_key, fmt)
+    if events_list is not None:
+        _LOGGER.debug(f"Serving snapshot for {calendar_entity} while refreshing")
+        # Nobody waits for this refresh, so it yields to interactive calls
+        task = _async_refresh_task(hass, calendar_entity, start_dt, end_dt, fmt, PRIORITY_BACKGROUND)
+        _async_notify_when_refreshed(hass, calendar_entity, task)
+        runtime.metrics.inc("stale_responses_total", calendar=calendar_entity, reason="snapshot")
+        return events_list, True
+
+    timeout = runtime.fetch_timeout
+    stale_list = event_cache.get_stale_serialized(cache_key, fmt)
+    if stale_list is None:
+        stale_list = snapshot.get(cache_key, fmt)
+    if not timeout or stale_list is None:
+        # Nothing to fall back to, wait for the provider
+        events_list = await async_fetch_serialized_events(
+            hass, calendar_entity, start_dt, end_dt, fmt, priority
+        )
+        return events_list, False
+
+    task = _async_refresh_task(hass, calendar_entity, start_dt, end_dt, fmt, priority)
+    try:
+        # Shield so the fetch keeps running when the budget runs out
+        events_list = await asyncio.wait_for(asyncio.shield(task), timeout)
+    except asyncio.TimeoutError:
+        _LOGGER.warning(
+            f"{calendar_entity} did not answer within {timeout}s, serving stale events"
+        )
+        _async_notify_when_refreshed(hass, calendar_entity, task)
+        runtime.metrics.inc("stale_responses_total", calendar=calendar_entity, reason="timeout")
+        return stale_list, True
+    return events_list, False
+
+
+async def async_fetch_many_serialized_events(
+    hass: HomeAssistant, calendar_entities, start_dt, end_dt, fmt=FORMAT_FULL, priority=PRIORITY_INTERACTIVE
+):
+    """Fetch serialized events of several calendars concurrently.
+
+    Returns (events_by_calendar, errors, stale): events and errors keyed by
+    entity id, and the calendars that were served from the snapshot. A
+    failing or missing calendar only adds an error and does not fail the
+    others.
+    """
+    results = await asyncio.gather(
+        *(
+            async_get_serialized_events(hass, entity, start_dt, end_dt, fmt, priority)
+            for entity in calendar_entities
+        ),
+        return_exceptions=True,
+    )
+
+    events_by_calendar = {}
+    errors = {}
+    stale = []
+    for entity, result in zip(calendar_entities, results):
+        if isinstance(result, Exception):
+            _LOGGER.error(f"Error fetching events for {entity}: {result}")
+            errors[entity] = str(result)
+            continue
+
+        events_list, is_stale = result
+        if events_list is None:
+            errors[entity] = "Calendar entity not found"
+            continue
+
+        events_by_calendar[entity] = events_list
+        if is_stale:
+            stale.append(entity)
+    return events_by_calendar, errors, stale
@@ -0,0 +1,176 @@
+"""In-memory counters and latency histograms for Family Calendar."""
+from bisect import bisect_left
+
+from .const import DOMAIN, METRICS_LATENCY_BUCKETS
+
+PREFIX = DOMAIN
+
+# Content type of the Prometheus text exposition format
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# name: (type, help)
+METRICS = {
+    "view_requests_total": ("counter", "API requests by view and HTTP status."),
+    "view_duration_seconds": ("histogram", "API request duration by view."),
+    "upstream_requests_total": ("counter", "async_get_events calls by calendar and result."),
+    "upstream_duration_seconds": ("histogram", "async_get_events duration by calendar."),
+    "coalesced_fetches_total": ("counter", "Fetches that joined an identical in-flight fetch."),
+    "cache_lookups_total": (
+        "counter",
+        "Lookups by calendar, layer (window cache or range store) and result.",
+    ),
+    "stale_responses_total": ("counter", "Responses served stale by calendar and reason."),
+    "write_attempts_total": ("counter", "Write attempts by calendar, path and result."),
+    "write_fallbacks_total": (
+        "counter",
+        "Writes that moved on to another path after one failed, by calendar and operation.",
+    ),
+}
+
+
+class Histogram:
+    """Counts of observed durations per upper bound, with their sum."""
+
+    def __init__(self, buckets=METRICS_LATENCY_BUCKETS):
+        """Initialize the histogram."""
+        self.buckets = buckets
+        # The last count is for observations above the largest bound
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, seconds):
+        """Record one duration."""
+        self.counts[bisect_left(self.buckets, seconds)] += 1
+        self.sum += seconds
+        self.count += 1
+
+    def cumulative(self):
+        """Return (upper bound, observations at or below it), ending with +Inf."""
+        total = 0
+        result = []
+        for bound, count in zip(list(self.buckets) + [float("inf")], self.counts):
+            total += count
+            result.append((bound, total))
+        return result
+
+    def as_dict(self):
+        """Return the histogram for diagnostics."""
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 6),
+            "mean": round(self.sum / self.count, 6) if self.count else None,
+            "buckets": {
+                ("+Inf" if bound == float("inf") else str(bound)): total
+                for bound, total in self.cumulative()
+            },
+        }
+
+
+def _escape(value):
+    """Escape a label value for the Prometheus text format."""
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels, extra=()):
+    """Return a Prometheus label set such as {view="events"}."""
+    pairs = list(labels) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in pairs) + "}"
+
+
+def _format_bound(bound):
+    """Return a histogram bound as Prometheus writes it."""
+    return "+Inf" if bound == float("inf") else repr(float(bound))
+
+
+class Metrics:
+    """Counters and histograms keyed by metric name and label set.
+
+    Kept in memory only, so they restart from zero with Home Assistant.
+    They are exposed as Prometheus text by the metrics view and in the
+    config entry diagnostics.
+    """
+
+    def __init__(self):
+        """Initialize the metrics."""
+        self._counters = {}
+        self._histograms = {}
+
+    def inc(self, name, amount=1, **labels):
+        """Increase a counter."""
+        key = (name, tuple(sorted(labels.items())))
+        self._counters[key] = self._counters.get(key, 0) + amount
+
+    def observe(self, name, seconds, **labels):
+        """Record a duration in a histogram."""
+        key = (name, tuple(sorted(labels.items())))
+        histogram = self._histograms.get(key)
+        if histogram is None:
+            histogram = self._histograms[key] = Histogram()
+        histogram.observe(seconds)
+
+    def hit_ratios(self):
+        """Return the hit ratio of each cache layer, or None if never used."""
+        lookups = {}
+        for (name, labels), value in self._counters.items():
+            if name != "cache_lookups_total":
+                continue
+            labels = dict(labels)
+            hits, total = lookups.get(labels["layer"], (0, 0))
+            hit = value if labels["result"] == "hit" else 0
+            lookups[labels["layer"]] = (hits + hit, total + value)
+        return {
+            layer: round(hits / total, 4) if total else None
+            for layer, (hits, total) in lookups.items()
+        }
+
+    def as_dict(self):
+        """Return all metrics for diagnostics."""
+        counters = {}
+        for (name, labels), value in sorted(self._counters.items()):
+            counters.setdefault(name, []).append({"labels": dict(labels), "value": value})
+        histograms = {}
+        for (name, labels), histogram in sorted(
+            self._histograms.items(), key=lambda item: item[0]
+        ):
+            histograms.setdefault(name, []).append(
+                {"labels": dict(labels), **histogram.as_dict()}
+            )
+        return {
+            "counters": counters,
+            "histograms": histograms,
+            "cache_hit_ratios": self.hit_ratios(),
+        }
+
+    def prometheus_text(self):
+        """Return all metrics in the Prometheus text exposition format."""
+        lines = []
+        for name, (metric_type, help_text) in METRICS.items():
+            full_name = f"{PREFIX}_{name}"
+            if metric_type == "counter":
+                series = sorted(
+                    (labels, value) for (key, labels), value in self._counters.items() if key == name
+                )
+            else:
+                series = sorted(
+                    ((labels, histogram) for (key, labels), histogram in self._histograms.items() if key == name),
+                    key=lambda item: item[0],
+                )
+            if not series:
+                continue
+
+            lines.append(f"# HELP {full_name} {help_text}")
+            lines.append(f"# TYPE {full_name} {metric_type}")
+            for labels, value in series:
+                if metric_type == "counter":
+                    lines.append(f"{full_name}{_format_labels(labels)} {value}")
+                    continue
+                for bound, total in value.cumulative():
+                    lines.append(
+                        f"{full_name}_bucket{_format_labels(labels, [('le', _format_bound(bound))])} {total}"
+                    )
+                lines.append(f"{full_name}_sum{_format_labels(labels)} {value.sum:.6f}")
+                lines.append(f"{full_name}_count{_format_labels(labels)} {value.count}")
+        return "\n".join(lines) + "\n"
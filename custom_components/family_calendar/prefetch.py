@@ -0,0 +1,92 @@
+"""Background prefetch of adjacent windows for Family Calendar."""
+import asyncio
+import logging
+
+from homeassistant.core import HomeAssistant, callback
+
+from .const import DEFAULT_PREFETCH_DEPTH, PREFETCH_DELAY
+from .events import async_fetch_serialized_events
+from .scheduler import PRIORITY_BACKGROUND
+from .serialization import FORMAT_FULL
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def adjacent_windows(start_dt, end_dt, depth):
+    """Return the windows next to a window, nearest first.
+
+    Windows are shifted by the window's own length, so a week yields the
+    weeks around it. For each step the next window comes before the
+    previous one, since navigating forward is the common case.
+    """
+    length = end_dt - start_dt
+    windows = []
+    for step in range(1, depth + 1):
+        windows.append((start_dt + length * step, end_dt + length * step))
+        windows.append((start_dt - length * step, end_dt - length * step))
+    return windows
+
+
+class EventPrefetcher:
+    """Warm the event cache for the windows around the one just served.
+
+    Prefetches run as background tasks after a short delay, one upstream
+    fetch at a time, so they never compete with the request that triggered
+    them. A new request for the same calendars cancels a prefetch that is
+    still running, since the user has navigated on.
+    """
+
+    def __init__(self, hass: HomeAssistant, depth=DEFAULT_PREFETCH_DEPTH):
+        """Initialize the prefetcher."""
+        self.hass = hass
+        self.depth = depth
+        self._tasks = {}
+
+    @callback
+    def schedule(self, calendar_entities, start_dt, end_dt, fmt=FORMAT_FULL):
+        """Prefetch the windows around start_dt..end_dt if enabled."""
+        if self.depth <= 0 or end_dt <= start_dt:
+            return
+
+        key = tuple(calendar_entities)
+        self._cancel(key)
+        task = self.hass.async_create_background_task(
+            self._async_prefetch(calendar_entities, start_dt, end_dt, fmt),
+            f"family_calendar prefetch {','.join(key)}",
+        )
+        self._tasks[key] = task
+
+        @callback
+        def async_done(_):
+            """Forget the task unless a newer one replaced it."""
+            if self._tasks.get(key) is task:
+                del self._tasks[key]
+
+        task.add_done_callback(async_done)
+
+    @callback
+    def async_stop(self):
+        """Cancel all running prefetches."""
+        for key in list(self._tasks):
+            self._cancel(key)
+
+    @callback
+    def _cancel(self, key):
+        """Cancel the running prefetch for a set of calendars, if any."""
+        task = self._tasks.pop(key, None)
+        if task is not None and not task.done():
+            task.cancel()
+
+    async def _async_prefetch(self, calendar_entities, start_dt, end_dt, fmt):
+        """Fetch the adjacent windows one calendar at a time."""
+        await asyncio.sleep(PREFETCH_DELAY)
+        for window_start, window_end in adjacent_windows(start_dt, end_dt, self.depth):
+            for entity in calendar_entities:
+                try:
+                    await async_fetch_serialized_events(
+                        self.hass, entity, window_start, window_end, fmt, PRIORITY_BACKGROUND
+                    )
+                except Exception as e:
+                    # The foreground request will report real errors
+                    _LOGGER.debug(f"Prefetch failed for {entity}: {e}")
+        _LOGGER.debug(f"Prefetched windows around {start_dt} for {len(calendar_entities)} calendars")
@@ -0,0 +1,136 @@
+"""Calendar entity resolution for Family Calendar."""
+import logging
+from dataclasses import dataclass
+
+from homeassistant.components.calendar import (
+    DOMAIN as CALENDAR_DOMAIN,
+    CalendarEntityFeature,
+)
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.event import async_track_state_removed_domain
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass
+class ResolvedCalendar:
+    """A calendar entity with its platform, capabilities and write paths."""
+
+    entity_id: str
+    entity: object
+    platform: str
+    supported_features: int
+    # Write paths that worked last time, e.g. "google.create_event"
+    create_method: str = None
+    update_method: str = None
+    delete_method: str = None
+
+    @property
+    def can_create(self):
+        """Return True if the calendar supports creating events."""
+        return bool(self.supported_features & CalendarEntityFeature.CREATE_EVENT)
+
+    @property
+    def can_update(self):
+        """Return True if the calendar supports updating events."""
+        return bool(self.supported_features & CalendarEntityFeature.UPDATE_EVENT)
+
+    @property
+    def can_delete(self):
+        """Return True if the calendar supports deleting events."""
+        return bool(self.supported_features & CalendarEntityFeature.DELETE_EVENT)
+
+
+class CalendarResolver:
+    """Map calendar entity ids to entity objects and capabilities.
+
+    Resolutions are kept until the entity registry changes or the entity's
+    state is removed (for example when its integration reloads).
+    """
+
+    def __init__(self, hass: HomeAssistant):
+        """Initialize the resolver."""
+        self.hass = hass
+        self._resolved = {}
+        self._unsubscribers = []
+
+    @callback
+    def async_start(self):
+        """Start listening for changes that invalidate resolutions."""
+        if self._unsubscribers:
+            return
+
+        @callback
+        def async_registry_updated(event):
+            """Forget entities that changed in the entity registry."""
+            self.invalidate(event.data.get("entity_id"))
+            old_entity_id = event.data.get("old_entity_id")
+            if old_entity_id:
+                self.invalidate(old_entity_id)
+
+        @callback
+        def async_state_removed(event):
+            """Forget entities whose state was removed."""
+            self.invalidate(event.data["entity_id"])
+
+        self._unsubscribers = [
+            self.hass.bus.async_listen(
+                er.EVENT_ENTITY_REGISTRY_UPDATED, async_registry_updated
+            ),
+            async_track_state_removed_domain(
+                self.hass, CALENDAR_DOMAIN, async_state_removed
+            ),
+        ]
+
+    @callback
+    def async_stop(self):
+        """Stop listening and forget all resolutions."""
+        for unsubscribe in self._unsubscribers:
+            unsubscribe()
+        self._unsubscribers = []
+        self._resolved.clear()
+
+    def invalidate(self, entity_id=None):
+        """Forget one resolution, or all of them if no entity id is given."""
+        if entity_id is None:
+            self._resolved.clear()
+        else:
+            self._resolved.pop(entity_id, None)
+
+    def resolve(self, entity_id):
+        """Return the ResolvedCalendar for entity_id, or None if not found."""
+        resolved = self._resolved.get(entity_id)
+        if resolved is not None:
+            return resolved
+
+        entity_entry = er.async_get(self.hass).async_get(entity_id)
+        if not entity_entry:
+            _LOGGER.warning(f"Entity not found in registry: {entity_id}")
+            return None
+
+        # Get the state to verify it exists
+        state = self.hass.states.get(entity_id)
+        if not state:
+            _LOGGER.warning(f"Entity state not found: {entity_id}")
+            return None
+
+        entity_component = self.hass.data.get("entity_components", {}).get(CALENDAR_DOMAIN)
+        if not entity_component:
+            _LOGGER.error("Calendar component not found")
+            return None
+
+        entity = entity_component.get_entity(entity_id)
+        if not entity:
+            _LOGGER.warning(f"Calendar entity object not found: {entity_id}")
+            return None
+
+        resolved = ResolvedCalendar(
+            entity_id=entity_id,
+            entity=entity,
+            platform=entity_entry.platform,
+            supported_features=entity.supported_features or 0,
+        )
+        self._resolved[entity_id] = resolved
+        _LOGGER.debug(f"Resolved {entity_id} (platform {resolved.platform})")
+        return resolved
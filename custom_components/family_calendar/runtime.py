@@ -0,0 +1,148 @@
+"""Typed runtime data for Family Calendar."""
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+from homeassistant.core import HomeAssistant
+
+from .const import (
+    CONF_CALENDARS,
+    DEFAULT_COLOR,
+    DEFAULT_FETCH_TIMEOUT,
+    DEFAULT_TIMING_LOG_RATE,
+    DOMAIN,
+)
+
+if TYPE_CHECKING:
+    # Only for annotations, these modules use the runtime themselves
+    from .assets import FrontendAssets
+    from .cache import EventCache
+    from .metrics import Metrics
+    from .prefetch import EventPrefetcher
+    from .resolver import CalendarResolver
+    from .scheduler import UpstreamScheduler
+    from .snapshot import EventSnapshot
+    from .store import EventStore
+    from .sync import SyncTracker
+    from .weather import WeatherForecastCache
+
+
+@dataclass
+class CalendarConfig:
+    """Display settings of one calendar."""
+
+    entity_id: str
+    color: str = DEFAULT_COLOR
+    name: str = None
+
+
+def entry_calendars(data):
+    """Return the CalendarConfigs held by a config entry's data.
+
+    Handles both the consolidated format, where ``calendars`` maps entity ids
+    to their settings, and the original one-calendar-per-entry format.
+    """
+    if CONF_CALENDARS in data:
+        return [
+            CalendarConfig(
+                entity_id=entity_id,
+                color=settings.get("color") or DEFAULT_COLOR,
+                name=settings.get("name") or None,
+            )
+            for entity_id, settings in data[CONF_CALENDARS].items()
+        ]
+
+    calendar_entity = data.get("calendar_entity")
+    if not calendar_entity:
+        return []
+    return [
+        CalendarConfig(
+            entity_id=calendar_entity,
+            color=data.get("color") or DEFAULT_COLOR,
+            name=data.get("name") or None,
+        )
+    ]
+
+
+def settings_entry(entries):
+    """Return the config entry whose global settings apply, or None.
+
+    Settings such as the cache TTL are shared by all calendars, so only one
+    entry's apply: the consolidated entry, else the oldest one. Home
+    Assistant keeps entries in creation order, so the choice does not
+    depend on which entry happens to be set up last.
+    """
+    entries = list(entries)
+    for entry in entries:
+        if CONF_CALENDARS in entry.data:
+            return entry
+    return entries[0] if entries else None
+
+
+@dataclass
+class FamilyCalendarData:
+    """Calendars and weather entity of all loaded config entries."""
+
+    calendars: dict = field(default_factory=dict)
+    weather_entity: str = None
+
+    @classmethod
+    def from_entries(cls, entries):
+        """Build the runtime data from config entries, in setup order.
+
+        The weather entity is global; the last entry that sets one wins.
+        """
+        runtime = cls()
+        for entry in entries:
+            for calendar in entry_calendars(entry.data):
+                runtime.calendars[calendar.entity_id] = calendar
+            if entry.data.get("weather_entity"):
+                runtime.weather_entity = entry.data["weather_entity"]
+        return runtime
+
+    def as_config(self):
+        """Return the payload of the config endpoint."""
+        return {
+            "calendars": list(self.calendars),
+            "colors": {c.entity_id: c.color for c in self.calendars.values()},
+            "names": {c.entity_id: c.name for c in self.calendars.values() if c.name},
+            "weather_entity": self.weather_entity,
+        }
+
+
+@dataclass
+class FamilyCalendarRuntime:
+    """Services and state shared by all entries.
+
+    Created once in ``async_setup`` and kept in ``hass.data[DOMAIN]`` for as
+    long as Home Assistant runs; entries only change ``data`` and the
+    settings.
+    """
+
+    event_cache: "EventCache"
+    event_store: "EventStore"
+    scheduler: "UpstreamScheduler"
+    sync_tracker: "SyncTracker"
+    snapshot: "EventSnapshot"
+    resolver: "CalendarResolver"
+    prefetcher: "EventPrefetcher"
+    metrics: "Metrics"
+    weather_cache: "WeatherForecastCache"
+    frontend_assets: "FrontendAssets"
+    data: FamilyCalendarData = field(default_factory=FamilyCalendarData)
+    # Loaded config entries by entry id, in setup order
+    entries: dict = field(default_factory=dict)
+    # Running upstream fetches as (task, QueueTicket) and background
+    # refreshes, by window
+    in_flight: dict = field(default_factory=dict)
+    refresh_tasks: dict = field(default_factory=dict)
+    # Bumped by every write to a calendar, so fetches started before the
+    # write know not to cache their results
+    generations: dict = field(default_factory=dict)
+    fetch_timeout: float = DEFAULT_FETCH_TIMEOUT
+    timing_log_rate: float = DEFAULT_TIMING_LOG_RATE
+    panel_registered: bool = False
+
+
+def get_runtime(hass: HomeAssistant) -> FamilyCalendarRuntime:
+    """Return the runtime created by async_setup."""
+    return hass.data[DOMAIN]
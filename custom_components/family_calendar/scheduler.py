@@ -0,0 +1,193 @@
+"""Per-platform scheduling of upstream calendar calls for Family Calendar."""
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from contextlib import asynccontextmanager
+
+from .const import DEFAULT_UPSTREAM_LIMIT, DEFAULT_UPSTREAM_LIMITS
+from .timing import phase
+
+_LOGGER = logging.getLogger(__name__)
+
+# Lower runs first
+PRIORITY_WRITE = 0
+PRIORITY_INTERACTIVE = 1
+PRIORITY_BACKGROUND = 2
+
+
+class QueueTicket:
+    """The priority of one call, which can be raised while the call waits.
+
+    A shared fetch queued by a prefetch must not keep an interactive request
+    that joins it waiting behind the rest of the background work.
+    """
+
+    def __init__(self, priority):
+        """Initialize the ticket."""
+        self.priority = priority
+        self._limiter = None
+
+    def raise_to(self, priority):
+        """Move the call ahead if the given priority is more urgent."""
+        if priority >= self.priority:
+            return
+        self.priority = priority
+        if self._limiter is not None:
+            self._limiter.reorder()
+
+
+class PlatformLimiter:
+    """A semaphore and token bucket for the calls to one platform.
+
+    At most ``concurrency`` calls run at once and, if ``rate`` is above 0,
+    calls start at no more than ``rate`` per second with bursts of up to
+    ``concurrency`` calls. Waiting calls start in priority order, then in
+    arrival order.
+    """
+
+    def __init__(self, platform, concurrency, rate):
+        """Initialize the limiter."""
+        self.platform = platform
+        self.concurrency = concurrency
+        self.rate = rate
+        self._active = 0
+        self._tokens = float(concurrency)
+        self._updated = time.monotonic()
+        self._waiters = []
+        self._order = itertools.count()
+        self._wakeup = None
+
+    def configure(self, concurrency, rate):
+        """Change the limits, letting waiting calls start if they now fit."""
+        self.concurrency = concurrency
+        self.rate = rate
+        self._tokens = min(self._tokens, float(concurrency))
+        self._dispatch()
+
+    async def acquire(self, ticket):
+        """Wait until a call with the given QueueTicket may start."""
+        if not self._waiters and self._try_start():
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        # A list, so reorder() can update the priority in place
+        heapq.heappush(self._waiters, [ticket.priority, next(self._order), future, ticket])
+        ticket._limiter = self
+        # Waiters ahead of this one may have been cancelled
+        self._dispatch()
+        if not future.done():
+            _LOGGER.debug(
+                f"Queued {self.platform} call with priority {ticket.priority}, {len(self._waiters)} waiting"
+            )
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Cancelled right after being let through, give the slot back
+                self.release()
+            raise
+        finally:
+            ticket._limiter = None
+
+    def release(self):
+        """Mark a call as finished and start the next waiting one."""
+        self._active -= 1
+        self._dispatch()
+
+    def reorder(self):
+        """Re-sort the waiting calls after a ticket's priority was raised."""
+        for waiter in self._waiters:
+            waiter[0] = waiter[3].priority
+        heapq.heapify(self._waiters)
+
+    def cancel(self):
+        """Stop the pending wake-up timer."""
+        if self._wakeup is not None:
+            self._wakeup.cancel()
+            self._wakeup = None
+
+    def _try_start(self):
+        """Take a slot and a token if both are available."""
+        if self._active >= self.concurrency:
+            return False
+        if self.rate > 0:
+            now = time.monotonic()
+            self._tokens = min(
+                float(self.concurrency), self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+        self._active += 1
+        return True
+
+    def _dispatch(self):
+        """Start waiting calls in priority order while limits allow."""
+        self.cancel()
+        while self._waiters:
+            future = self._waiters[0][2]
+            if future.done():
+                # The waiting call was cancelled
+                heapq.heappop(self._waiters)
+                continue
+            if not self._try_start():
+                if self._active < self.concurrency:
+                    # Only out of tokens, try again once the next one is due
+                    delay = (1 - self._tokens) / self.rate
+                    self._wakeup = asyncio.get_running_loop().call_later(delay, self._dispatch)
+                return
+            heapq.heappop(self._waiters)
+            future.set_result(None)
+
+
+class UpstreamScheduler:
+    """Limit and order the upstream calls made to each calendar platform.
+
+    Every platform (google, caldav, local, ...) gets its own PlatformLimiter,
+    so a slow or rate-limited provider does not hold back the others. Writes
+    go ahead of interactive reads, which go ahead of background refreshes
+    and prefetches.
+    """
+
+    def __init__(self):
+        """Initialize the scheduler."""
+        self.limits = dict(DEFAULT_UPSTREAM_LIMITS)
+        self._limiters = {}
+
+    def configure(self, platform, concurrency, rate):
+        """Set the concurrency and calls per second (0 = unlimited) of a platform."""
+        self.limits[platform] = (concurrency, rate)
+        limiter = self._limiters.get(platform)
+        if limiter is not None:
+            limiter.configure(concurrency, rate)
+
+    def _limiter(self, platform):
+        """Return the limiter of a platform, creating it on first use."""
+        limiter = self._limiters.get(platform)
+        if limiter is None:
+            concurrency, rate = self.limits.get(platform, DEFAULT_UPSTREAM_LIMIT)
+            limiter = self._limiters[platform] = PlatformLimiter(platform, concurrency, rate)
+        return limiter
+
+    @asynccontextmanager
+    async def slot(self, platform, priority=PRIORITY_INTERACTIVE, ticket=None):
+        """Wait for and hold a slot for one upstream call to a platform.
+
+        Pass a QueueTicket instead of a priority to be able to raise the
+        call's priority while it waits.
+        """
+        limiter = self._limiter(platform or "unknown")
+        with phase("queue"):
+            await limiter.acquire(ticket or QueueTicket(priority))
+        try:
+            yield
+        finally:
+            limiter.release()
+
+    def async_stop(self):
+        """Stop pending wake-up timers."""
+        for limiter in self._limiters.values():
+            limiter.cancel()
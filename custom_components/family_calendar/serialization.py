@@ -0,0 +1,102 @@
+"""Event serialization for Family Calendar.
+
+This module has no Home Assistant imports so it can be benchmarked on its own.
+"""
+from datetime import date, datetime
+
+FORMAT_FULL = "full"
+FORMAT_COMPACT = "compact"
+FORMATS = (FORMAT_FULL, FORMAT_COMPACT)
+
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+
+def serialize_events(events):
+    """Convert calendar events to the dict format used by the frontend."""
+    events_list = []
+    append = events_list.append
+    for event in events:
+        start = event.start
+        end = event.end
+
+        # All-day events have plain dates, timed events have datetimes
+        if isinstance(start, datetime):
+            event_dict = {
+                "summary": event.summary,
+                "start": {"dateTime": start.isoformat()},
+                "end": {"dateTime": end.isoformat()},
+            }
+        else:
+            event_dict = {
+                "summary": event.summary,
+                "start": {"date": start.isoformat()},
+                "end": {"date": end.isoformat()},
+            }
+
+        description = getattr(event, "description", None)
+        if description:
+            event_dict["description"] = description
+        location = getattr(event, "location", None)
+        if location:
+            event_dict["location"] = location
+        uid = getattr(event, "uid", None)
+        if uid:
+            event_dict["uid"] = uid
+        recurrence_id = getattr(event, "recurrence_id", None)
+        if recurrence_id:
+            event_dict["recurrence_id"] = recurrence_id
+
+        append(event_dict)
+
+    return events_list
+
+
+def serialize_events_compact(events):
+    """Convert calendar events to the compact format.
+
+    Keys are shortened (s=summary, b=begin, e=end, a=all-day, d=description,
+    l=location, u=uid, r=recurrence_id) and times are epoch seconds. All-day
+    dates are encoded as midnight UTC of that date.
+    """
+    events_list = []
+    append = events_list.append
+    for event in events:
+        start = event.start
+        end = event.end
+
+        if isinstance(start, datetime):
+            event_dict = {
+                "s": event.summary,
+                "b": int(start.timestamp()),
+                "e": int(end.timestamp()),
+            }
+        else:
+            event_dict = {
+                "s": event.summary,
+                "b": (start.toordinal() - _EPOCH_ORDINAL) * 86400,
+                "e": (end.toordinal() - _EPOCH_ORDINAL) * 86400,
+                "a": 1,
+            }
+
+        description = getattr(event, "description", None)
+        if description:
+            event_dict["d"] = description
+        location = getattr(event, "location", None)
+        if location:
+            event_dict["l"] = location
+        uid = getattr(event, "uid", None)
+        if uid:
+            event_dict["u"] = uid
+        recurrence_id = getattr(event, "recurrence_id", None)
+        if recurrence_id:
+            event_dict["r"] = recurrence_id
+
+        append(event_dict)
+
+    return events_list
+
+
+SERIALIZERS = {
+    FORMAT_FULL: serialize_events,
+    FORMAT_COMPACT: serialize_events_compact,
+}
@@ -0,0 +1,173 @@
+"""Home Assistant services for Family Calendar."""
+import logging
+
+import voluptuous as vol
+from homeassistant.core import HomeAssistant, ServiceCall, SupportsResponse, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import config_validation as cv
+
+from .const import DOMAIN, MAX_BATCH_OPERATIONS
+from .events import async_fetch_many_serialized_events, parse_window
+from .serialization import FORMAT_FULL, FORMATS
+from .writer import (
+    async_create_event,
+    async_delete_event,
+    async_run_operations,
+    async_update_event,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+SERVICE_ADD_EVENT = "add_event"
+SERVICE_UPDATE_EVENT = "update_event"
+SERVICE_DELETE_EVENT = "delete_event"
+SERVICE_GET_EVENTS = "get_events"
+SERVICE_BATCH_WRITE = "batch_write"
+
+EVENT_FIELDS = {
+    vol.Required("calendar_entity"): cv.entity_id,
+    vol.Required("summary"): cv.string,
+    vol.Required("start_date_time"): cv.string,
+    vol.Required("end_date_time"): cv.string,
+    vol.Optional("description", default=""): cv.string,
+    vol.Optional("location", default=""): cv.string,
+}
+
+ADD_EVENT_SCHEMA = vol.Schema(EVENT_FIELDS)
+
+UPDATE_EVENT_SCHEMA = vol.Schema(
+    {**EVENT_FIELDS, vol.Required("event_uid"): cv.string}
+)
+
+DELETE_EVENT_SCHEMA = vol.Schema(
+    {
+        vol.Required("calendar_entity"): cv.entity_id,
+        vol.Required("event_uid"): cv.string,
+    }
+)
+
+GET_EVENTS_SCHEMA = vol.Schema(
+    {
+        vol.Required("calendars"): vol.All(cv.ensure_list, [cv.entity_id]),
+        vol.Required("start"): cv.string,
+        vol.Required("end"): cv.string,
+        vol.Optional("format", default=FORMAT_FULL): vol.In(FORMATS),
+    }
+)
+
+OPERATION_SCHEMA = vol.Schema(
+    {
+        vol.Required("op"): vol.In(("add", "update", "delete")),
+        vol.Required("calendar_entity"): cv.entity_id,
+        vol.Optional("event_uid"): cv.string,
+        # Alias of event_uid, as in the HTTP views
+        vol.Optional("event_id"): cv.string,
+        vol.Optional("summary"): cv.string,
+        vol.Optional("start_date_time"): cv.string,
+        vol.Optional("end_date_time"): cv.string,
+        vol.Optional("description", default=""): cv.string,
+        vol.Optional("location", default=""): cv.string,
+    }
+)
+
+BATCH_WRITE_SCHEMA = vol.Schema(
+    {
+        vol.Required("operations"): vol.All(
+            cv.ensure_list, vol.Length(max=MAX_BATCH_OPERATIONS), [OPERATION_SCHEMA]
+        )
+    }
+)
+
+
+@callback
+def async_register_services(hass: HomeAssistant):
+    """Register the Family Calendar services.
+
+    These run the same code as the HTTP views, so automations can write and
+    read events without going through aiohttp and JSON.
+    """
+
+    async def async_add_event(call: ServiceCall):
+        """Create an event on a calendar."""
+        method = await async_create_event(
+            hass,
+            call.data["calendar_entity"],
+            call.data["summary"],
+            call.data["start_date_time"],
+            call.data["end_date_time"],
+            call.data["description"],
+            call.data["location"],
+        )
+        return {"method": method}
+
+    async def async_update_event_service(call: ServiceCall):
+        """Update an event on a calendar."""
+        method = await async_update_event(
+            hass,
+            call.data["calendar_entity"],
+            call.data["event_uid"],
+            call.data["summary"],
+            call.data["start_date_time"],
+            call.data["end_date_time"],
+            call.data["description"],
+            call.data["location"],
+        )
+        return {"method": method}
+
+    async def async_delete_event_service(call: ServiceCall):
+        """Delete an event from a calendar."""
+        method = await async_delete_event(
+            hass, call.data["calendar_entity"], call.data["event_uid"]
+        )
+        return {"method": method}
+
+    async def async_get_events(call: ServiceCall):
+        """Return the serialized events of some calendars in a window."""
+        try:
+            start_dt, end_dt = parse_window(call.data["start"], call.data["end"])
+        except ValueError as e:
+            raise HomeAssistantError(f"Invalid start or end: {e}") from e
+
+        calendar_entities = list(dict.fromkeys(call.data["calendars"]))
+        events_by_calendar, errors, stale = await async_fetch_many_serialized_events(
+            hass, calendar_entities, start_dt, end_dt, call.data["format"]
+        )
+        return {
+            "events": events_by_calendar,
+            "errors": errors,
+            "stale": stale,
+            "format": call.data["format"],
+        }
+
+    async def async_batch_write(call: ServiceCall):
+        """Run a list of add/update/delete operations."""
+        results = await async_run_operations(hass, call.data["operations"])
+        failed = [result for result in results if not result["success"]]
+        if failed:
+            _LOGGER.warning(f"Batch write: {len(failed)} of {len(results)} operations failed")
+        return {"results": results}
+
+    for service, handler, schema in (
+        (SERVICE_ADD_EVENT, async_add_event, ADD_EVENT_SCHEMA),
+        (SERVICE_UPDATE_EVENT, async_update_event_service, UPDATE_EVENT_SCHEMA),
+        (SERVICE_DELETE_EVENT, async_delete_event_service, DELETE_EVENT_SCHEMA),
+    ):
+        hass.services.async_register(
+            DOMAIN, service, handler, schema=schema, supports_response=SupportsResponse.OPTIONAL
+        )
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_EVENTS,
+        async_get_events,
+        schema=GET_EVENTS_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_BATCH_WRITE,
+        async_batch_write,
+        schema=BATCH_WRITE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
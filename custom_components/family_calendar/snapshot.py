@@ -0,0 +1,96 @@
+"""Persistent snapshot of served events for Family Calendar cold starts."""
+import logging
+from collections import OrderedDict
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import (
+    DEFAULT_SNAPSHOT_MAX_WINDOWS,
+    SNAPSHOT_SAVE_DELAY,
+    SNAPSHOT_STORAGE_KEY,
+    SNAPSHOT_STORAGE_VERSION,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class EventSnapshot:
+    """Last known serialized events per (calendar, window, format) in .storage.
+
+    After a restart the snapshot is served right away, marked stale, while
+    the provider is asked in the background. A window is only served from
+    the snapshot until it was refreshed once in this run; from then on the
+    event cache takes over. Writes to disk are batched with a delayed save.
+    """
+
+    def __init__(self, hass: HomeAssistant, max_windows=DEFAULT_SNAPSHOT_MAX_WINDOWS):
+        """Initialize the snapshot."""
+        self.hass = hass
+        self.max_windows = max_windows
+        self._store = Store(hass, SNAPSHOT_STORAGE_VERSION, SNAPSHOT_STORAGE_KEY)
+        self._windows = OrderedDict()
+        self._refreshed = set()
+
+    @staticmethod
+    def make_key(cache_key, fmt):
+        """Build the storage key for an event cache key and format."""
+        return "|".join(cache_key + (fmt,))
+
+    async def async_load(self):
+        """Load the snapshot written before the last shutdown."""
+        try:
+            data = await self._store.async_load()
+        except Exception as e:
+            _LOGGER.warning(f"Could not load event snapshot: {e}")
+            return
+
+        if data:
+            self._windows = OrderedDict(data.get("windows", {}))
+            _LOGGER.debug(f"Loaded event snapshot with {len(self._windows)} windows")
+
+    def get(self, cache_key, fmt):
+        """Return the last known events for a window, if any."""
+        return self._windows.get(self.make_key(cache_key, fmt))
+
+    def get_stale(self, cache_key, fmt):
+        """Return snapshot events for a window not yet refreshed in this run."""
+        key = self.make_key(cache_key, fmt)
+        if key in self._refreshed:
+            return None
+        return self._windows.get(key)
+
+    @callback
+    def update(self, cache_key, fmt, events_list):
+        """Remember freshly fetched events and schedule a save."""
+        key = self.make_key(cache_key, fmt)
+        self._refreshed.add(key)
+        if self._windows.get(key) == events_list:
+            return
+
+        self._windows[key] = events_list
+        self._windows.move_to_end(key)
+        while len(self._windows) > self.max_windows:
+            evicted, _ = self._windows.popitem(last=False)
+            self._refreshed.discard(evicted)
+        self._store.async_delay_save(self._data_to_save, SNAPSHOT_SAVE_DELAY)
+
+    @callback
+    def invalidate(self, calendar_entity):
+        """Drop the windows of a calendar that was written to or removed."""
+        prefix = f"{calendar_entity}|"
+        self._refreshed = {key for key in self._refreshed if not key.startswith(prefix)}
+        stale_keys = [key for key in self._windows if key.startswith(prefix)]
+        for key in stale_keys:
+            del self._windows[key]
+        if stale_keys:
+            self._store.async_delay_save(self._data_to_save, SNAPSHOT_SAVE_DELAY)
+
+    @callback
+    def _data_to_save(self):
+        """Return the data to write to .storage."""
+        return {"windows": dict(self._windows)}
+
+    def __len__(self):
+        """Return the number of stored windows."""
+        return len(self._windows)
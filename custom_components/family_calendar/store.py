@@ -0,0 +1,183 @@
+"""Interval-indexed event store for Family Calendar."""
+import logging
+import time
+from bisect import bisect_left
+from datetime import timedelta
+
+from .const import DEFAULT_CACHE_TTL, DEFAULT_STORE_MAX_EVENTS
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def event_identity(event):
+    """Identify an occurrence so events held by two ranges are kept once."""
+    return (event.uid, event.recurrence_id, event.summary, event.start, event.end)
+
+
+class HeldRange:
+    """A fetched time range of one calendar with its events indexed by start.
+
+    Events are sorted by start, so the events overlapping a window are found
+    by bisecting between ``window start - longest event`` and ``window end``.
+    """
+
+    def __init__(self, start, end, events, fetched_at):
+        """Initialize the range."""
+        self.start = start
+        self.end = end
+        self.fetched_at = fetched_at
+        self.last_used = fetched_at
+        self.events = sorted(events, key=lambda event: event.start_datetime_local)
+        self._starts = [event.start_datetime_local for event in self.events]
+        self._longest = max(
+            (event.end_datetime_local - event.start_datetime_local for event in self.events),
+            default=timedelta(0),
+        )
+
+    def overlapping(self, start, end):
+        """Return the held events overlapping [start, end)."""
+        low = bisect_left(self._starts, start - self._longest)
+        high = bisect_left(self._starts, end)
+        return [event for event in self.events[low:high] if event.end_datetime_local > start]
+
+    def merged(self, other):
+        """Return a range covering this one and an adjacent or overlapping one."""
+        seen = set()
+        events = []
+        for event in self.events + other.events:
+            identity = event_identity(event)
+            if identity not in seen:
+                seen.add(identity)
+                events.append(event)
+        held = HeldRange(
+            min(self.start, other.start),
+            max(self.end, other.end),
+            events,
+            # The merged range expires with its oldest part
+            min(self.fetched_at, other.fetched_at),
+        )
+        held.last_used = max(self.last_used, other.last_used)
+        return held
+
+
+class EventStore:
+    """Per-calendar ranges already fetched from upstream, with their events.
+
+    Any window is answered by slicing the held ranges; only the parts of it
+    that no live range covers (``gaps``) need to be fetched. Ranges expire
+    after ``ttl`` seconds, and the least recently used ones are dropped once
+    more than ``max_events`` events are held. Writes to a calendar should
+    call ``invalidate`` so the next read goes upstream again.
+    """
+
+    def __init__(self, ttl=DEFAULT_CACHE_TTL, max_events=DEFAULT_STORE_MAX_EVENTS):
+        """Initialize the store."""
+        self.ttl = ttl
+        self.max_events = max_events
+        self._ranges = {}
+
+    def _live_ranges(self, calendar_entity):
+        """Drop the expired ranges of a calendar and return the others."""
+        ranges = self._ranges.get(calendar_entity)
+        if not ranges:
+            return []
+        now = time.monotonic()
+        live = [held for held in ranges if now - held.fetched_at <= self.ttl]
+        if len(live) != len(ranges):
+            self._ranges[calendar_entity] = live
+        return live
+
+    def gaps(self, calendar_entity, start, end):
+        """Return the (start, end) parts of a window no live range covers."""
+        if self.ttl <= 0:
+            return [(start, end)]
+
+        gaps = []
+        cursor = start
+        for held in self._live_ranges(calendar_entity):
+            if held.end <= cursor:
+                continue
+            if held.start >= end:
+                break
+            if held.start > cursor:
+                gaps.append((cursor, held.start))
+            cursor = max(cursor, held.end)
+            if cursor >= end:
+                break
+        if cursor < end:
+            gaps.append((cursor, end))
+        return gaps
+
+    def add(self, calendar_entity, start, end, events):
+        """Hold the events fetched for [start, end) of a calendar."""
+        if self.ttl <= 0:
+            return
+
+        new = HeldRange(start, end, events, time.monotonic())
+        ranges = []
+        for held in self._live_ranges(calendar_entity):
+            # Ranges that touch are merged so lookups stay cheap
+            if held.end < new.start or held.start > new.end:
+                ranges.append(held)
+            else:
+                new = new.merged(held)
+        ranges.append(new)
+        ranges.sort(key=lambda held: held.start)
+        self._ranges[calendar_entity] = ranges
+        self._evict()
+
+    def slice(self, calendar_entity, start, end):
+        """Return (events, fetched_at) for the held events overlapping [start, end).
+
+        Events are sorted by start. ``fetched_at`` is when the oldest range
+        used was fetched, or None if no range overlaps the window.
+        """
+        now = time.monotonic()
+        fetched_at = None
+        seen = set()
+        events = []
+        for held in self._live_ranges(calendar_entity):
+            if held.end <= start or held.start >= end:
+                continue
+            held.last_used = now
+            if fetched_at is None or held.fetched_at < fetched_at:
+                fetched_at = held.fetched_at
+            for event in held.overlapping(start, end):
+                identity = event_identity(event)
+                if identity not in seen:
+                    seen.add(identity)
+                    events.append(event)
+        events.sort(key=lambda event: event.start_datetime_local)
+        return events, fetched_at
+
+    def _evict(self):
+        """Drop least recently used ranges while too many events are held."""
+        held_ranges = [
+            (held.last_used, calendar_entity, held)
+            for calendar_entity, ranges in self._ranges.items()
+            for held in ranges
+        ]
+        total = sum(len(held.events) for _, _, held in held_ranges)
+        if total <= self.max_events:
+            return
+
+        held_ranges.sort(key=lambda item: item[0])
+        # Always keep the range just added so the current request is answered
+        for _, calendar_entity, held in held_ranges[:-1]:
+            if total <= self.max_events:
+                break
+            self._ranges[calendar_entity].remove(held)
+            total -= len(held.events)
+            _LOGGER.debug(f"Event store evicted {calendar_entity} {held.start} - {held.end}")
+
+    def invalidate(self, calendar_entity=None):
+        """Drop the ranges of a calendar, or everything if none is given."""
+        if calendar_entity is None:
+            self._ranges.clear()
+            return
+        self._ranges.pop(calendar_entity, None)
+        _LOGGER.debug(f"Event store invalidated for {calendar_entity}")
+
+    def __len__(self):
+        """Return the number of held ranges."""
+        return sum(len(ranges) for ranges in self._ranges.values())
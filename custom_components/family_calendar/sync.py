@@ -0,0 +1,114 @@
+"""Incremental event sync for Family Calendar."""
+import hashlib
+import json
+import logging
+from collections import OrderedDict
+
+from .const import DEFAULT_SYNC_MAX_SNAPSHOTS
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def event_key(event_dict):
+    """Return the identity of a serialized event used for diffing.
+
+    Works for both the full and the compact serialization format.
+    """
+    uid = event_dict.get("uid") or event_dict.get("u")
+    if uid:
+        recurrence_id = event_dict.get("recurrence_id") or event_dict.get("r")
+        return f"{uid}/{recurrence_id}" if recurrence_id else uid
+
+    if "s" in event_dict:
+        return f"{event_dict['s']}|{event_dict.get('b')}"
+
+    start = event_dict.get("start", {})
+    start_value = start.get("dateTime") or start.get("date")
+    return f"{event_dict.get('summary')}|{start_value}"
+
+
+def key_events(events_list):
+    """Map serialized events by their key, disambiguating duplicates."""
+    keyed = {}
+    for event_dict in events_list:
+        key = event_key(event_dict)
+        if key in keyed:
+            suffix = 1
+            while f"{key}#{suffix}" in keyed:
+                suffix += 1
+            key = f"{key}#{suffix}"
+        keyed[key] = event_dict
+    return keyed
+
+
+class SyncTracker:
+    """Hand out sync tokens and diff event snapshots against them.
+
+    A token is a content hash of one calendar window, so every client that
+    saw the same events holds the same token. The last ``max_snapshots``
+    snapshots are kept; an unknown token gets a full response.
+    """
+
+    def __init__(self, max_snapshots=DEFAULT_SYNC_MAX_SNAPSHOTS):
+        """Initialize the tracker."""
+        self.max_snapshots = max_snapshots
+        self._snapshots = OrderedDict()
+
+    @staticmethod
+    def _make_token(scope, keyed_events):
+        """Hash a calendar window and its events into a sync token."""
+        payload = json.dumps([scope, keyed_events], sort_keys=True, default=str)
+        return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:20]
+
+    def _remember(self, token, scope, keyed_events):
+        """Store a snapshot, evicting the oldest ones if needed."""
+        self._snapshots[token] = (scope, keyed_events)
+        self._snapshots.move_to_end(token)
+        while len(self._snapshots) > self.max_snapshots:
+            self._snapshots.popitem(last=False)
+
+    def _find_snapshot(self, scope, since_tokens):
+        """Return (token, events) for the first known token matching scope."""
+        for token in since_tokens:
+            snapshot = self._snapshots.get(token)
+            if snapshot is not None and snapshot[0] == scope:
+                self._snapshots.move_to_end(token)
+                return token, snapshot[1]
+        return None, None
+
+    def sync(self, scope, events_list, since_tokens=()):
+        """Return a full or incremental sync payload for a calendar window.
+
+        ``scope`` identifies the window (calendar entity, start, end) and
+        ``since_tokens`` are the tokens the client currently holds. An
+        incremental payload names the token it was diffed against in
+        ``since_token``.
+        """
+        keyed_events = key_events(events_list)
+        token = self._make_token(scope, keyed_events)
+        since_token, previous = self._find_snapshot(scope, since_tokens)
+        self._remember(token, scope, keyed_events)
+
+        if previous is None:
+            return {"sync_token": token, "full": True, "events": keyed_events}
+
+        added = {}
+        changed = {}
+        for key, event_dict in keyed_events.items():
+            if key not in previous:
+                added[key] = event_dict
+            elif previous[key] != event_dict:
+                changed[key] = event_dict
+        removed = [key for key in previous if key not in keyed_events]
+
+        _LOGGER.debug(
+            f"Sync {scope[0]}: {len(added)} added, {len(changed)} changed, {len(removed)} removed"
+        )
+        return {
+            "sync_token": token,
+            "since_token": since_token,
+            "full": False,
+            "added": added,
+            "changed": changed,
+            "removed": removed,
+        }
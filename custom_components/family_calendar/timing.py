@@ -0,0 +1,114 @@
+"""Per-request phase timings for the Family Calendar views.
+
+A view handler runs inside a RequestTimer; code anywhere below it records
+phases with ``phase(name)`` without the timer being passed around. Tasks
+started while handling the request (batch fetches, shared upstream fetches)
+inherit the timer through the context.
+"""
+import functools
+import logging
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from .runtime import get_runtime
+
+_LOGGER = logging.getLogger(__name__)
+
+SERVER_TIMING_HEADER = "Server-Timing"
+
+_current_timer = ContextVar("family_calendar_request_timer", default=None)
+
+
+class RequestTimer:
+    """Phase durations of one request, summed per phase name."""
+
+    def __init__(self, view):
+        """Initialize the timer."""
+        self.view = view
+        self.started = time.perf_counter()
+        self.phases = {}
+
+    def add(self, name, seconds):
+        """Record one run of a phase."""
+        total, count = self.phases.get(name, (0.0, 0))
+        self.phases[name] = (total + seconds, count + 1)
+
+    @property
+    def elapsed(self):
+        """Return the seconds since the request started."""
+        return time.perf_counter() - self.started
+
+    def header(self):
+        """Return the Server-Timing header value, phases in recording order."""
+        metrics = []
+        for name, (total, count) in self.phases.items():
+            metric = f"{name};dur={total * 1000:.1f}"
+            if count > 1:
+                # Concurrent runs can add up to more than the total
+                metric += f';desc="{count} calls"'
+            metrics.append(metric)
+        metrics.append(f"total;dur={self.elapsed * 1000:.1f}")
+        return ", ".join(metrics)
+
+    def summary(self):
+        """Return the timings as one log line."""
+        phases = " ".join(
+            f"{name}={total * 1000:.1f}ms" + (f"({count})" if count > 1 else "")
+            for name, (total, count) in self.phases.items()
+        )
+        return f"{self.view} total={self.elapsed * 1000:.1f}ms {phases}".rstrip()
+
+
+@contextmanager
+def phase(name):
+    """Record the duration of the enclosed block on the current request, if any."""
+    timer = _current_timer.get()
+    if timer is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timer.add(name, time.perf_counter() - started)
+
+
+def timed_view(name):
+    """Time a HomeAssistantView handler and send its phases as Server-Timing.
+
+    Every request is also counted and timed in the metrics, and the share
+    of requests set by the ``timing_log_rate`` option is logged, so slow
+    renders can be analysed without browser tools.
+    """
+
+    def decorator(handler):
+        """Wrap one handler."""
+
+        @functools.wraps(handler)
+        async def wrapper(view, request, *args, **kwargs):
+            """Run the handler inside a request timer."""
+            timer = RequestTimer(name)
+            token = _current_timer.set(timer)
+            runtime = get_runtime(view.hass)
+            metrics = runtime.metrics
+            try:
+                response = await handler(view, request, *args, **kwargs)
+            except Exception:
+                metrics.inc("view_requests_total", view=name, status="exception")
+                raise
+            finally:
+                _current_timer.reset(token)
+                metrics.observe("view_duration_seconds", timer.elapsed, view=name)
+
+            metrics.inc("view_requests_total", view=name, status=str(response.status))
+            response.headers[SERVER_TIMING_HEADER] = timer.header()
+            sample_rate = runtime.timing_log_rate
+            if sample_rate and random.random() < sample_rate:
+                _LOGGER.info(f"Timing {timer.summary()} status={response.status}")
+            return response
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,131 @@
+"""Cached weather forecast for Family Calendar."""
+import asyncio
+import hashlib
+import logging
+from datetime import timedelta
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import (
+    async_track_state_change_event,
+    async_track_time_interval,
+)
+from homeassistant.helpers.json import json_bytes
+
+from .const import WEATHER_REFRESH_INTERVAL
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class WeatherForecastCache:
+    """Keep the daily forecast of one weather entity in memory.
+
+    The forecast is refreshed in the background on a fixed interval and when
+    the weather entity changes state. Concurrent requests share a single
+    in-flight ``weather.get_forecasts`` call.
+    """
+
+    def __init__(self, hass: HomeAssistant):
+        """Initialize the cache."""
+        self.hass = hass
+        self.entity_id = None
+        self.body = None
+        self.etag = None
+        self.error = None
+        self._refresh_task = None
+        self._unsubscribers = []
+
+    async def async_get(self, entity_id):
+        """Return (body, etag) of the cached forecast for entity_id.
+
+        The body is the JSON-encoded forecast, or None if no forecast is
+        available.
+        """
+        if entity_id != self.entity_id:
+            self._async_track(entity_id)
+
+        if self.body is None:
+            await self.async_refresh()
+        return self.body, self.etag
+
+    async def async_refresh(self):
+        """Refresh the forecast, joining a refresh that is already running."""
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = self.hass.async_create_task(self._async_update())
+        # Shield so a cancelled request does not cancel the shared refresh
+        await asyncio.shield(self._refresh_task)
+
+    @callback
+    def async_stop(self):
+        """Stop background refreshes and forget the forecast."""
+        for unsubscribe in self._unsubscribers:
+            unsubscribe()
+        self._unsubscribers = []
+        self.entity_id = None
+        self.body = None
+        self.etag = None
+        self.error = None
+
+    @callback
+    def _async_track(self, entity_id):
+        """Start refreshing in the background for a new weather entity."""
+        self.async_stop()
+        self.entity_id = entity_id
+
+        @callback
+        def async_schedule_refresh(*_):
+            """Refresh in the background."""
+            if self._refresh_task is None or self._refresh_task.done():
+                self._refresh_task = self.hass.async_create_task(self._async_update())
+
+        self._unsubscribers = [
+            async_track_state_change_event(self.hass, [entity_id], async_schedule_refresh),
+            async_track_time_interval(
+                self.hass, async_schedule_refresh, timedelta(seconds=WEATHER_REFRESH_INTERVAL)
+            ),
+        ]
+
+    async def _async_update(self):
+        """Fetch the forecast and store it with its ETag."""
+        entity_id = self.entity_id
+        try:
+            forecast = await self._async_fetch_forecast(entity_id)
+        except Exception as e:
+            # Keep serving the last known forecast
+            _LOGGER.error(f"Error fetching weather: {e}")
+            self.error = str(e)
+            return
+
+        if entity_id != self.entity_id:
+            return
+
+        self.error = None
+        if forecast is None:
+            self.body = None
+            self.etag = None
+            return
+
+        body = json_bytes(forecast)
+        self.body = body
+        self.etag = f'"{hashlib.sha1(body).hexdigest()}"'
+        _LOGGER.debug(f"Weather forecast refreshed for {entity_id}")
+
+    async def _async_fetch_forecast(self, entity_id):
+        """Return the daily forecast for entity_id, or None if unavailable."""
+        # Try to get forecast using the service (modern way)
+        if self.hass.services.has_service("weather", "get_forecasts"):
+            response = await self.hass.services.async_call(
+                "weather",
+                "get_forecasts",
+                {"entity_id": entity_id, "type": "daily"},
+                blocking=True,
+                return_response=True
+            )
+            if response and entity_id in response:
+                return response[entity_id].get("forecast", [])
+
+        # Fallback to state attributes (legacy way)
+        state = self.hass.states.get(entity_id)
+        if state and "forecast" in state.attributes:
+            return state.attributes["forecast"]
+
+        return None
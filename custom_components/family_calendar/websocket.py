@@ -0,0 +1,127 @@
+"""Websocket API for Family Calendar push updates."""
+import asyncio
+import logging
+from datetime import timedelta
+
+import voluptuous as vol
+from homeassistant.components import websocket_api
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from homeassistant.helpers.event import (
+    async_track_state_change_event,
+    async_track_time_interval,
+)
+
+from .const import PUSH_REFRESH_INTERVAL, SIGNAL_CALENDAR_UPDATED
+from .events import async_fetch_many_serialized_events, parse_window, sync_events
+from .scheduler import PRIORITY_BACKGROUND, PRIORITY_INTERACTIVE
+from .serialization import FORMAT_FULL, FORMATS
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@callback
+def async_register_websocket_commands(hass: HomeAssistant):
+    """Register the Family Calendar websocket commands."""
+    websocket_api.async_register_command(hass, websocket_subscribe_events)
+
+
+def _has_changes(payload):
+    """Return True if a sync payload carries anything for the client."""
+    return payload["full"] or any(
+        payload[field] for field in ("added", "changed", "removed")
+    )
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "family_calendar/subscribe_events",
+        vol.Required("calendars"): vol.All(cv.ensure_list, [cv.entity_id]),
+        vol.Required("start"): str,
+        vol.Required("end"): str,
+        vol.Optional("since", default=[]): vol.All(cv.ensure_list, [str]),
+        vol.Optional("format", default=FORMAT_FULL): vol.In(FORMATS),
+    }
+)
+@websocket_api.async_response
+async def websocket_subscribe_events(hass: HomeAssistant, connection, msg):
+    """Subscribe to event deltas for a set of calendars and one window.
+
+    Deltas are pushed when a calendar entity changes state, when one of
+    our own write views touches a calendar, and on a slow safety refresh.
+    """
+    calendar_entities = list(dict.fromkeys(msg["calendars"]))
+    fmt = msg["format"]
+    try:
+        start_dt, end_dt = parse_window(msg["start"], msg["end"])
+    except ValueError as e:
+        connection.send_error(msg["id"], "invalid_format", str(e))
+        return
+
+    # The client's tokens are only used for the first push; after that we
+    # track the token of the last payload we sent per calendar
+    sync_tokens = {entity: list(msg["since"]) for entity in calendar_entities}
+    push_lock = asyncio.Lock()
+
+    async def async_push(entities, priority=PRIORITY_BACKGROUND):
+        """Fetch, diff and send the changes for some calendars."""
+        async with push_lock:
+            # Stale snapshot windows are pushed too; the background refresh
+            # sends a calendar update once fresh events are in
+            fetched, errors, _ = await async_fetch_many_serialized_events(
+                hass, entities, start_dt, end_dt, fmt, priority
+            )
+
+            events_by_calendar = {}
+            for entity, events_list in fetched.items():
+                payload = sync_events(
+                    hass, entity, start_dt, end_dt, events_list, sync_tokens[entity], fmt
+                )
+                sync_tokens[entity] = [payload["sync_token"]]
+                if _has_changes(payload):
+                    events_by_calendar[entity] = payload
+
+            if events_by_calendar or errors:
+                connection.send_message(
+                    websocket_api.event_message(
+                        msg["id"], {"events": events_by_calendar, "errors": errors}
+                    )
+                )
+
+    @callback
+    def async_calendar_updated(calendar_entity):
+        """Push changes for a calendar that was written to or changed state."""
+        if calendar_entity in sync_tokens:
+            hass.async_create_task(async_push([calendar_entity]))
+
+    @callback
+    def async_state_changed(event):
+        """Handle a state change of a subscribed calendar entity."""
+        async_calendar_updated(event.data["entity_id"])
+
+    @callback
+    def async_refresh(now):
+        """Re-check all subscribed calendars for upstream changes."""
+        hass.async_create_task(async_push(calendar_entities))
+
+    unsubscribers = [
+        async_dispatcher_connect(hass, SIGNAL_CALENDAR_UPDATED, async_calendar_updated),
+        async_track_state_change_event(hass, calendar_entities, async_state_changed),
+        async_track_time_interval(
+            hass, async_refresh, timedelta(seconds=PUSH_REFRESH_INTERVAL)
+        ),
+    ]
+
+    @callback
+    def async_unsubscribe():
+        """Tear down all listeners of this subscription."""
+        for unsubscribe in unsubscribers:
+            unsubscribe()
+
+    connection.subscriptions[msg["id"]] = async_unsubscribe
+    connection.send_result(msg["id"])
+    _LOGGER.debug(f"Push subscription {msg['id']} for {len(calendar_entities)} calendars")
+
+    # Bring the client up to date with what it already holds
+    await async_push(calendar_entities, PRIORITY_INTERACTIVE)
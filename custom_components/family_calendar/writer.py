@@ -0,0 +1,444 @@
+"""Event write operations for Family Calendar.
+
+Each calendar's working create and delete paths are chosen from its
+platform and supported features, and the path that succeeded is
+remembered on its ResolvedCalendar so later writes go straight to it.
+"""
+import asyncio
+import logging
+from datetime import datetime
+
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.util import dt as dt_util
+
+from .const import DEFAULT_WRITE_CONCURRENCY
+from .events import invalidate_calendar
+from .runtime import get_runtime
+from .scheduler import PRIORITY_WRITE
+from .timing import phase
+
+_LOGGER = logging.getLogger(__name__)
+
+CREATE_GOOGLE = "google.create_event"
+CREATE_CALENDAR = "calendar.create_event"
+UPDATE_NATIVE = "entity.async_update_event"
+UPDATE_RECREATE = "delete+create"
+
+# Services some calendar integrations expose for deleting events
+DELETE_SERVICES = (
+    ("google", "delete_event"),
+    ("google", "remove_event"),
+    ("calendar", "delete_event"),
+    ("calendar", "remove_event"),
+)
+
+# Entity methods some calendar integrations expose for deleting events
+DELETE_ENTITY_METHODS = (
+    "async_delete_event",
+    "async_remove_event",
+    "delete_event",
+    "remove_event",
+)
+
+UPDATE_ERROR = (
+    "Failed to update event. The calendar may be read-only or missing write permissions."
+)
+
+READ_ONLY_ERROR = (
+    "This calendar is read-only or missing write permissions. "
+    "Select a calendar that supports event creation (Local/CalDAV) or reconfigure the Google integration "
+    "with write access."
+)
+
+
+class WriteError(HomeAssistantError):
+    """A calendar write failed; carries the HTTP status and error details."""
+
+    def __init__(self, message, status=403, **details):
+        """Initialize the error."""
+        super().__init__(message)
+        self.status = status
+        self.details = details
+
+    def as_dict(self):
+        """Return the JSON error payload for the views."""
+        return {"error": str(self), **self.details}
+
+
+def _ordered(methods, remembered):
+    """Put the remembered method first, keeping the others as fallbacks."""
+    if remembered in methods:
+        return [remembered] + [m for m in methods if m != remembered]
+    return methods
+
+
+def _create_methods(hass: HomeAssistant, resolved):
+    """Return the create paths to try for a calendar, best first."""
+    google_available = hass.services.has_service("google", "create_event")
+    if resolved is None:
+        # Unknown calendar, try everything like we always did
+        return ([CREATE_GOOGLE] if google_available else []) + [CREATE_CALENDAR]
+
+    methods = []
+    if resolved.platform == "google" and google_available:
+        methods.append(CREATE_GOOGLE)
+    if resolved.can_create:
+        methods.append(CREATE_CALENDAR)
+    return _ordered(methods, resolved.create_method)
+
+
+def _delete_methods(hass: HomeAssistant, resolved):
+    """Return the delete paths to try for a calendar, best first."""
+    methods = []
+    if resolved is not None and resolved.can_delete:
+        methods.append("entity.async_delete_event")
+    for domain, service in DELETE_SERVICES:
+        if hass.services.has_service(domain, service):
+            methods.append(f"{domain}.{service}")
+    if resolved is not None:
+        for attr_name in DELETE_ENTITY_METHODS:
+            method = f"entity.{attr_name}"
+            if method not in methods and getattr(resolved.entity, attr_name, None):
+                methods.append(method)
+        return _ordered(methods, resolved.delete_method)
+    return methods
+
+
+def _write_slot(hass: HomeAssistant, resolved):
+    """Return the scheduler slot for one write call to a calendar."""
+    platform = resolved.platform if resolved is not None else None
+    return get_runtime(hass).scheduler.slot(platform, PRIORITY_WRITE)
+
+
+def _record_attempt(hass: HomeAssistant, resolved, operation, method, success, fallback=False):
+    """Count a write attempt, and a fallback if another path is tried next.
+
+    Only calendars that resolve are counted, so made-up entity ids sent to
+    the views cannot add metric series.
+    """
+    if resolved is None:
+        return
+    metrics = get_runtime(hass).metrics
+    metrics.inc(
+        "write_attempts_total",
+        calendar=resolved.entity_id,
+        method=method,
+        result="ok" if success else "error",
+    )
+    if fallback:
+        metrics.inc("write_fallbacks_total", calendar=resolved.entity_id, operation=operation)
+
+
+def _build_create_data(
+    method, calendar_entity, summary, start_date_time, end_date_time, description, location
+):
+    """Build the service data for a create path."""
+    if method == CREATE_GOOGLE:
+        # Google service expects strings in format "YYYY-MM-DD HH:MM:SS"
+        service_data = {
+            "entity_id": calendar_entity,
+            "summary": summary,
+            "start_date_time": start_date_time,
+            "end_date_time": end_date_time,
+        }
+    else:
+        service_data = {
+            "entity_id": calendar_entity,
+            "summary": summary,
+            "start_date_time": datetime.strptime(start_date_time, "%Y-%m-%d %H:%M:%S"),
+            "end_date_time": datetime.strptime(end_date_time, "%Y-%m-%d %H:%M:%S"),
+        }
+
+    if description:
+        service_data["description"] = description
+    if location:
+        service_data["location"] = location
+    return service_data
+
+
+async def async_create_event(
+    hass: HomeAssistant,
+    calendar_entity,
+    summary,
+    start_date_time,
+    end_date_time,
+    description="",
+    location="",
+    invalidate=True,
+):
+    """Create an event on a calendar.
+
+    Returns the create path that succeeded, or raises WriteError.
+    """
+    resolved = get_runtime(hass).resolver.resolve(calendar_entity)
+    methods = _create_methods(hass, resolved)
+    if not methods:
+        _LOGGER.warning(f"{calendar_entity} does not support creating events")
+        raise WriteError(READ_ONLY_ERROR, calendar=calendar_entity)
+
+    errors = {}
+    for method in methods:
+        domain, service = method.split(".")
+        service_data = _build_create_data(
+            method, calendar_entity, summary, start_date_time, end_date_time, description, location
+        )
+        _LOGGER.debug(f"Calling {method} for {calendar_entity}")
+        try:
+            # One phase per attempt shows the time spent in failed fallbacks
+            with phase(method):
+                async with _write_slot(hass, resolved):
+                    await hass.services.async_call(domain, service, service_data, blocking=True)
+        except Exception as e:
+            _LOGGER.error(f"{method} failed: {type(e).__name__}: {e}")
+            errors[f"{domain}_error"] = str(e)
+            _record_attempt(hass, resolved, "create", method, False, method != methods[-1])
+            continue
+
+        _record_attempt(hass, resolved, "create", method, True)
+        _LOGGER.info(f"Successfully created event '{summary}' using {method}")
+        if resolved is not None:
+            resolved.create_method = method
+        if invalidate:
+            invalidate_calendar(hass, calendar_entity)
+        return method
+
+    raise WriteError(READ_ONLY_ERROR, calendar=calendar_entity, **errors)
+
+
+async def async_delete_event(hass: HomeAssistant, calendar_entity, event_uid, invalidate=True):
+    """Delete an event from a calendar.
+
+    Returns the delete path that succeeded, or raises WriteError.
+    """
+    resolved = get_runtime(hass).resolver.resolve(calendar_entity)
+    methods = _delete_methods(hass, resolved)
+    if not methods:
+        raise WriteError(
+            "No supported calendar delete service available in Home Assistant.",
+            status=501,
+            calendar=calendar_entity,
+        )
+
+    # Provide multiple attribute names since integrations differ on payloads
+    service_payload = {
+        "entity_id": calendar_entity,
+        "event_id": event_uid,
+        "uid": event_uid,
+    }
+
+    deletion_attempts = []
+    for method in methods:
+        target, name = method.split(".")
+        try:
+            with phase(method):
+                async with _write_slot(hass, resolved):
+                    if target == "entity":
+                        handler = getattr(resolved.entity, name)
+                        if name.startswith("async_"):
+                            await handler(event_uid)
+                        else:
+                            await hass.async_add_executor_job(handler, event_uid)
+                    else:
+                        await hass.services.async_call(target, name, service_payload, blocking=True)
+        except Exception as e:
+            msg = f"{method} failed: {e}"
+            _LOGGER.error(msg)
+            deletion_attempts.append(msg)
+            _record_attempt(hass, resolved, "delete", method, False, method != methods[-1])
+            continue
+
+        _record_attempt(hass, resolved, "delete", method, True)
+        _LOGGER.info(f"Deleted event {event_uid} from {calendar_entity} using {method}")
+        if resolved is not None:
+            resolved.delete_method = method
+        if invalidate:
+            invalidate_calendar(hass, calendar_entity)
+        return method
+
+    raise WriteError(
+        "Unable to delete event – calendar may be read-only or does not expose a supported delete service.",
+        calendar=calendar_entity,
+        details=deletion_attempts,
+    )
+
+
+def _parse_local(date_time):
+    """Parse "YYYY-MM-DD HH:MM:SS" as a datetime in Home Assistant's time zone."""
+    return datetime.strptime(date_time, "%Y-%m-%d %H:%M:%S").replace(
+        tzinfo=dt_util.DEFAULT_TIME_ZONE
+    )
+
+
+async def async_update_event(
+    hass: HomeAssistant,
+    calendar_entity,
+    event_uid,
+    summary,
+    start_date_time,
+    end_date_time,
+    description="",
+    location="",
+    invalidate=True,
+):
+    """Update an event in place, or delete and recreate it as a fallback.
+
+    Returns the update path that succeeded, or raises WriteError.
+    """
+    resolved = get_runtime(hass).resolver.resolve(calendar_entity)
+
+    # Fast path: calendars supporting UPDATE_EVENT (Local, CalDAV, ...) take a
+    # single round-trip, unless native updates already failed for this one
+    if resolved is not None and resolved.can_update and resolved.update_method != UPDATE_RECREATE:
+        # Empty fields are sent too: calendars merge the update into the
+        # event, so a missing field would keep its old value
+        event = {
+            "summary": summary,
+            "dtstart": _parse_local(start_date_time),
+            "dtend": _parse_local(end_date_time),
+            "description": description or "",
+            "location": location or "",
+        }
+
+        try:
+            with phase(UPDATE_NATIVE):
+                async with _write_slot(hass, resolved):
+                    await resolved.entity.async_update_event(event_uid, event)
+        except NotImplementedError as e:
+            # Advertises UPDATE_EVENT without implementing it
+            _LOGGER.warning(
+                f"{UPDATE_NATIVE} is not supported by {calendar_entity}, falling back to delete and create: {e}"
+            )
+            resolved.update_method = UPDATE_RECREATE
+            _record_attempt(hass, resolved, "update", UPDATE_NATIVE, False, fallback=True)
+        except Exception as e:
+            # The calendar rejected this edit, recreating the event would
+            # most likely fail the same way after deleting it
+            _LOGGER.warning(f"{UPDATE_NATIVE} failed for {calendar_entity}: {e}")
+            _record_attempt(hass, resolved, "update", UPDATE_NATIVE, False)
+            raise WriteError(str(e), calendar=calendar_entity, method=UPDATE_NATIVE) from e
+        else:
+            _record_attempt(hass, resolved, "update", UPDATE_NATIVE, True)
+            _LOGGER.info(f"Successfully updated event '{summary}' using {UPDATE_NATIVE}")
+            resolved.update_method = UPDATE_NATIVE
+            if invalidate:
+                invalidate_calendar(hass, calendar_entity)
+            return UPDATE_NATIVE
+
+    # Fallback: delete the old event and create a new one
+    _LOGGER.info(f"Attempting to delete event {event_uid} from {calendar_entity}")
+    try:
+        await async_delete_event(hass, calendar_entity, event_uid, invalidate)
+    except WriteError as err:
+        # Continue anyway - maybe the event doesn't exist anymore
+        _LOGGER.warning(f"Could not delete old event {event_uid}. Attempts: {err.details}")
+
+    _LOGGER.debug(f"Creating updated event in: {calendar_entity}")
+    try:
+        await async_create_event(
+            hass,
+            calendar_entity,
+            summary,
+            start_date_time,
+            end_date_time,
+            description,
+            location,
+            invalidate,
+        )
+    except WriteError as err:
+        raise WriteError(UPDATE_ERROR, status=err.status, **err.details) from err
+
+    return UPDATE_RECREATE
+
+
+# Required fields per batch operation
+OPERATION_FIELDS = {
+    "add": ("calendar_entity", "summary", "start_date_time", "end_date_time"),
+    "update": ("calendar_entity", "event_uid", "summary", "start_date_time", "end_date_time"),
+    "delete": ("calendar_entity", "event_uid"),
+}
+
+
+async def _async_run_operation(hass: HomeAssistant, operation):
+    """Run one batch operation without invalidating caches."""
+    op = operation.get("op")
+    calendar_entity = operation.get("calendar_entity")
+    if not operation.get("event_uid") and operation.get("event_id"):
+        # Alias accepted by the views and the batch_write service
+        operation = {**operation, "event_uid": operation["event_id"]}
+
+    if op not in OPERATION_FIELDS:
+        raise WriteError(f"Unknown operation: {op}", status=400)
+    if not all(operation.get(field) for field in OPERATION_FIELDS[op]):
+        raise WriteError("Missing required fields", status=400)
+
+    if op == "add":
+        return await async_create_event(
+            hass,
+            calendar_entity,
+            operation["summary"],
+            operation["start_date_time"],
+            operation["end_date_time"],
+            operation.get("description", ""),
+            operation.get("location", ""),
+            invalidate=False,
+        )
+    if op == "update":
+        return await async_update_event(
+            hass,
+            calendar_entity,
+            operation["event_uid"],
+            operation["summary"],
+            operation["start_date_time"],
+            operation["end_date_time"],
+            operation.get("description", ""),
+            operation.get("location", ""),
+            invalidate=False,
+        )
+    return await async_delete_event(hass, calendar_entity, operation["event_uid"], invalidate=False)
+
+
+async def async_run_operations(hass: HomeAssistant, operations, concurrency=DEFAULT_WRITE_CONCURRENCY):
+    """Run a list of add/update/delete operations.
+
+    At most ``concurrency`` operations run at once per calendar. Returns one
+    result dict per operation, in order. Caches are invalidated once per
+    touched calendar after all operations finished.
+    """
+    semaphores = {}
+    touched = set()
+
+    async def async_run(index, operation):
+        """Run one operation under its calendar's semaphore."""
+        calendar_entity = operation.get("calendar_entity") if isinstance(operation, dict) else None
+        if not isinstance(calendar_entity, str) or not calendar_entity:
+            # Checked before the semaphore lookup, which needs a hashable key
+            return {
+                "index": index,
+                "success": False,
+                "status": 400,
+                "error": "calendar_entity must be a non-empty string",
+            }
+        semaphore = semaphores.setdefault(calendar_entity, asyncio.Semaphore(concurrency))
+        async with semaphore:
+            try:
+                method = await _async_run_operation(hass, operation)
+            except WriteError as err:
+                return {"index": index, "success": False, "status": err.status, **err.as_dict()}
+            except Exception as e:
+                _LOGGER.error(f"Batch operation {index} failed: {e}", exc_info=True)
+                return {"index": index, "success": False, "status": 500, "error": str(e)}
+
+        touched.add(calendar_entity)
+        return {"index": index, "success": True, "method": method}
+
+    results = await asyncio.gather(
+        *(async_run(index, operation) for index, operation in enumerate(operations))
+    )
+
+    for calendar_entity in touched:
+        invalidate_calendar(hass, calendar_entity)
+
+    succeeded = sum(1 for result in results if result["success"])
+    _LOGGER.info(f"Batch write: {succeeded}/{len(results)} operations succeeded")
+    return list(results)
@@ -110,6 +110,7 @@ const API_ENDPOINTS = {
     CONFIG: '/api/family_calendar/config',
     WEATHER: '/api/family_calendar/weather',
     EVENTS: '/api/family_calendar/events',
+    EVENTS_BATCH: '/api/family_calendar/events/batch',
     ADD_EVENT: '/api/family_calendar/add_event',
     UPDATE_EVENT: '/api/family_calendar/update_event',
     DELETE_EVENT: '/api/family_calendar/delete_event'
@@ -134,8 +135,30 @@ const WEATHER_ICONS = {
 };
 let selectedEventId = null;
 
+// Debug output is opt-in: open the panel page with ?debug=1
+const DEBUG = new URLSearchParams(window.location.search).has('debug');
+
 function debug(message) {
-    // Debug logging disabled for production
+    if (DEBUG) {
+        console.debug(`[Family Calendar] ${message}`);
+    }
+}
+
+// Show the fetch time next to the backend phases from the Server-Timing header
+function debugTiming(label, response, startedAt) {
+    if (!DEBUG) {
+        return;
+    }
+    const phases = (response.headers.get('Server-Timing') || '')
+        .split(',')
+        .map(metric => {
+            const [name, ...params] = metric.trim().split(';');
+            const duration = params.map(param => param.trim()).find(param => param.startsWith('dur='));
+            return duration ? `${name} ${duration.slice(4)} ms` : name;
+        })
+        .filter(Boolean);
+    const fetchTime = (performance.now() - startedAt).toFixed(1);
+    debug(`${label}: fetch ${fetchTime} ms${phases.length ? `, server ${phases.join(', ')}` : ''}`);
 }
 
 function getColorTint(color, alpha = 0.18) {
@@ -245,10 +268,13 @@ async function loadConfig() {
             headers['Authorization'] = `Bearer ${token}`;
         }
 
+        const startedAt = performance.now();
         const response = await fetch(API_ENDPOINTS.CONFIG, { 
             headers,
-            credentials: 'include'
+            credentials: 'include',
+            cache: 'no-cache'
         });
+        debugTiming('Config', response, startedAt);
         
         if (!response.ok) {
             debug(`Config API error: ${response.status} ${response.statusText}`);
@@ -294,10 +320,13 @@ async function fetchWeather() {
             headers['Authorization'] = `Bearer ${token}`;
         }
 
+        const startedAt = performance.now();
         const response = await fetch(API_ENDPOINTS.WEATHER, { 
             headers,
-            credentials: 'include'
+            credentials: 'include',
+            cache: 'no-cache'
         });
+        debugTiming('Weather', response, startedAt);
         
         if (!response.ok) {
             debug(`Weather API error: ${response.status}`);
@@ -467,16 +496,18 @@ async function fetchProxyEvents(calendarEntity, startDate, endDate) {
         headers['Authorization'] = `Bearer ${token}`;
     }
 
-    // Add cache-busting parameter to ensure fresh data
-    const cacheBuster = `cb=${Date.now()}`;
-    const url = `${API_ENDPOINTS.EVENTS}?calendar=${encodeURIComponent(calendarEntity)}&start=${encodeURIComponent(startDate)}&end=${encodeURIComponent(endDate)}&${cacheBuster}`;
+    // Revalidate with the server (If-None-Match) instead of busting the cache
+    const url = `${API_ENDPOINTS.EVENTS}?calendar=${encodeURIComponent(calendarEntity)}&start=${encodeURIComponent(startDate)}&end=${encodeURIComponent(endDate)}`;
+    const startedAt = performance.now();
     const response = await fetch(
         url,
         { 
             headers,
-            credentials: 'include'
+            credentials: 'include',
+            cache: 'no-cache'
         }
     );
+    debugTiming(`Events ${calendarEntity}`, response, startedAt);
     
     if (!response.ok) {
         throw new Error(`HTTP ${response.status}: ${response.statusText}`);
@@ -522,6 +553,272 @@ async function getEvents(calendarEntity, startDate, endDate) {
     }
 }
 
+function formatLocalDateTime(date) {
+    const hours = String(date.getHours()).padStart(2, '0');
+    const minutes = String(date.getMinutes()).padStart(2, '0');
+    const seconds = String(date.getSeconds()).padStart(2, '0');
+    return `${formatDate(date)}T${hours}:${minutes}:${seconds}`;
+}
+
+// Expand an event from the compact API format (short keys, epoch seconds)
+// into the shape used by the renderers
+function expandCompactEvent(compact) {
+    const event = { summary: compact.s };
+    if (compact.a) {
+        // All-day dates are encoded as midnight UTC
+        event.start = { date: new Date(compact.b * 1000).toISOString().split('T')[0] };
+        event.end = { date: new Date(compact.e * 1000).toISOString().split('T')[0] };
+    } else {
+        event.start = { dateTime: formatLocalDateTime(new Date(compact.b * 1000)) };
+        event.end = { dateTime: formatLocalDateTime(new Date(compact.e * 1000)) };
+    }
+    if (compact.d) event.description = compact.d;
+    if (compact.l) event.location = compact.l;
+    if (compact.u) event.uid = compact.u;
+    if (compact.r) event.recurrence_id = compact.r;
+    return event;
+}
+
+function expandEventMap(events) {
+    const expanded = {};
+    Object.entries(events || {}).forEach(([key, compact]) => {
+        expanded[key] = expandCompactEvent(compact);
+    });
+    return expanded;
+}
+
+// Incremental sync state per calendar window: { token, events: { key: event } }
+const syncState = new Map();
+const MAX_SYNC_WINDOWS = 24;
+
+function getSyncStateKey(calendarEntity, startDate, endDate) {
+    return `${calendarEntity}|${startDate}|${endDate}`;
+}
+
+function applySyncPayload(stateKey, payload) {
+    let state = syncState.get(stateKey);
+    if (!payload.full && (!state || state.token !== payload.since_token)) {
+        // Delta against a snapshot we no longer hold; drop the window so it is refetched
+        syncState.delete(stateKey);
+        return null;
+    }
+    if (payload.full) {
+        state = { token: null, events: {} };
+        Object.assign(state.events, expandEventMap(payload.events));
+    } else {
+        Object.assign(state.events, expandEventMap(payload.added), expandEventMap(payload.changed));
+        (payload.removed || []).forEach(key => delete state.events[key]);
+    }
+    state.token = payload.sync_token;
+    
+    // Re-insert so the most recently used windows are kept
+    syncState.delete(stateKey);
+    syncState.set(stateKey, state);
+    while (syncState.size > MAX_SYNC_WINDOWS) {
+        syncState.delete(syncState.keys().next().value);
+    }
+    
+    return Object.values(state.events);
+}
+
+async function fetchBatchEvents(calendarEntities, startDate, endDate) {
+    debug(`Fetching events for ${calendarEntities.length} calendars via batch`);
+    
+    const token = await getAuthToken();
+    const headers = {};
+    if (token && token !== 'USE_SESSION') {
+        headers['Authorization'] = `Bearer ${token}`;
+    }
+
+    // Send the sync tokens we hold so the server only returns what changed
+    const sinceTokens = calendarEntities
+        .map(calendar => syncState.get(getSyncStateKey(calendar, startDate, endDate)))
+        .filter(state => state && state.token)
+        .map(state => state.token);
+
+    const url = `${API_ENDPOINTS.EVENTS_BATCH}?calendars=${encodeURIComponent(calendarEntities.join(','))}&start=${encodeURIComponent(startDate)}&end=${encodeURIComponent(endDate)}&format=compact&sync=1&since=${encodeURIComponent(sinceTokens.join(','))}`;
+    const startedAt = performance.now();
+    const response = await fetch(
+        url,
+        { 
+            headers,
+            credentials: 'include',
+            cache: 'no-cache'
+        }
+    );
+    debugTiming(`Batch of ${calendarEntities.length} calendars`, response, startedAt);
+    
+    if (!response.ok) {
+        throw new Error(`HTTP ${response.status}: ${response.statusText}`);
+    }
+    
+    const data = await response.json();
+    const eventsByCalendar = {};
+    Object.entries(data.events || {}).forEach(([calendar, payload]) => {
+        let events = payload;
+        if (data.sync) {
+            events = applySyncPayload(getSyncStateKey(calendar, startDate, endDate), payload);
+        } else if (data.format === 'compact') {
+            events = payload.map(expandCompactEvent);
+        }
+        if (!events) {
+            return;
+        }
+        events.forEach(ensureEventIdentifier);
+        eventsByCalendar[calendar] = events;
+    });
+    Object.entries(data.errors || {}).forEach(([calendar, error]) => {
+        debug(`Batch error for ${calendar}: ${error}`);
+    });
+    // Stale calendars are refreshing on the server; live updates or the next
+    // auto-refresh bring the fresh events
+    (data.stale || []).forEach(calendar => {
+        debug(`Batch served stale events for ${calendar}`);
+    });
+    return eventsByCalendar;
+}
+
+// Live updates pushed over the Home Assistant websocket: { key, unsubscribe, ready }
+let liveSubscription = null;
+
+async function getHassConnection() {
+    try {
+        if (window.parent && window.parent.hassConnection) {
+            const { conn } = await window.parent.hassConnection;
+            return conn;
+        }
+    } catch (e) {
+        debug('Could not access Home Assistant websocket connection: ' + e.message);
+    }
+    return null;
+}
+
+function getLiveKey(calendarEntities, startDate, endDate) {
+    return `${calendarEntities.join(',')}|${startDate}|${endDate}`;
+}
+
+function isLiveWindow(calendarEntities, startDate, endDate) {
+    return Boolean(
+        liveSubscription &&
+        liveSubscription.ready &&
+        liveSubscription.key === getLiveKey(calendarEntities, startDate, endDate) &&
+        calendarEntities.every(calendar => syncState.has(getSyncStateKey(calendar, startDate, endDate)))
+    );
+}
+
+async function unsubscribeLiveUpdates() {
+    const subscription = liveSubscription;
+    liveSubscription = null;
+    if (subscription && subscription.unsubscribe) {
+        try {
+            await subscription.unsubscribe();
+        } catch (e) {
+            debug('Error unsubscribing live updates: ' + e.message);
+        }
+    }
+}
+
+function handleLiveUpdate(startDate, endDate, message) {
+    let changed = false;
+    Object.entries(message.events || {}).forEach(([calendar, payload]) => {
+        applySyncPayload(getSyncStateKey(calendar, startDate, endDate), payload);
+        changed = true;
+    });
+    Object.entries(message.errors || {}).forEach(([calendar, error]) => {
+        debug(`Live update error for ${calendar}: ${error}`);
+    });
+    if (changed) {
+        debug('Live update received, re-rendering');
+        renderCalendar();
+    }
+}
+
+async function subscribeLiveUpdates(calendarEntities, startDate, endDate) {
+    const key = getLiveKey(calendarEntities, startDate, endDate);
+    if (liveSubscription && liveSubscription.key === key) {
+        return;
+    }
+    await unsubscribeLiveUpdates();
+    
+    const conn = await getHassConnection();
+    if (!conn) {
+        return;
+    }
+    
+    const since = calendarEntities
+        .map(calendar => syncState.get(getSyncStateKey(calendar, startDate, endDate)))
+        .filter(state => state && state.token)
+        .map(state => state.token);
+    
+    const subscription = { key, unsubscribe: null, ready: false };
+    liveSubscription = subscription;
+    try {
+        const unsubscribe = await conn.subscribeMessage(
+            message => handleLiveUpdate(startDate, endDate, message),
+            {
+                type: 'family_calendar/subscribe_events',
+                calendars: calendarEntities,
+                start: startDate,
+                end: endDate,
+                since,
+                format: 'compact',
+            }
+        );
+        if (liveSubscription !== subscription) {
+            // Window changed while we were subscribing
+            await unsubscribe();
+            return;
+        }
+        subscription.unsubscribe = unsubscribe;
+        subscription.ready = true;
+        debug(`Subscribed to live updates for ${calendarEntities.length} calendars`);
+    } catch (error) {
+        debug('Live updates unavailable: ' + error.message);
+        if (liveSubscription === subscription) {
+            liveSubscription = null;
+        }
+    }
+}
+
+// Fetch events of all active calendars for a window in a single batch request,
+// falling back to per-calendar requests for anything the batch could not return
+async function loadEventsForWindow(startDate, endDate) {
+    const activeCalendars = calendars.filter(calendar => activeFilters.has(calendar));
+    if (activeCalendars.length === 0) {
+        await unsubscribeLiveUpdates();
+        return [];
+    }
+    
+    let eventsByCalendar = {};
+    if (isLiveWindow(activeCalendars, startDate, endDate)) {
+        // Pushed updates keep the sync state current, no need to ask the server
+        activeCalendars.forEach(calendar => {
+            const state = syncState.get(getSyncStateKey(calendar, startDate, endDate));
+            eventsByCalendar[calendar] = Object.values(state.events);
+        });
+    } else {
+        try {
+            eventsByCalendar = await fetchBatchEvents(activeCalendars, startDate, endDate);
+        } catch (error) {
+            debug(`Batch events request failed: ${error.message}`);
+        }
+        subscribeLiveUpdates(activeCalendars, startDate, endDate);
+    }
+    
+    const results = await Promise.all(activeCalendars.map(async calendar => {
+        const events = eventsByCalendar[calendar] || await getEvents(calendar, startDate, endDate);
+        events.forEach(event => {
+            event.calendar = calendar;
+            event.color = colors[calendar] || '#2196F3';
+        });
+        return events;
+    }));
+    
+    const allEvents = [];
+    results.forEach(events => allEvents.push(...events));
+    return allEvents;
+}
+
 // Switch view function
 function switchView(view) {
     currentView = view;
@@ -584,22 +881,7 @@ async function renderMonth() {
     const fetchStartDate = formatDate(daysToShow[0]);
     const fetchEndDate = formatDate(new Date(daysToShow[daysToShow.length - 1].getTime() + 24*60*60*1000));
     
-    const allEvents = [];
-    
-    // Fetch events in parallel for better performance
-    const eventPromises = calendars
-        .filter(calendar => activeFilters.has(calendar))
-        .map(async calendar => {
-            const events = await getEvents(calendar, fetchStartDate, fetchEndDate);
-            events.forEach(event => {
-                event.calendar = calendar;
-                event.color = colors[calendar] || '#2196F3';
-            });
-            return events;
-        });
-
-    const results = await Promise.all(eventPromises);
-    results.forEach(events => allEvents.push(...events));
+    const allEvents = await loadEventsForWindow(fetchStartDate, fetchEndDate);
     
     debug(`Total events fetched for month: ${allEvents.length}`);
     
@@ -741,22 +1023,7 @@ async function renderWorkingDays() {
     const startDate = formatDate(weekDays[0]);
     const endDate = formatDate(new Date(weekDays[4].getTime() + 24*60*60*1000));
     
-    const allEvents = [];
-    
-    // Fetch events in parallel for better performance
-    const eventPromises = calendars
-        .filter(calendar => activeFilters.has(calendar))
-        .map(async calendar => {
-            const events = await getEvents(calendar, startDate, endDate);
-            events.forEach(event => {
-                event.calendar = calendar;
-                event.color = colors[calendar] || '#2196F3';
-            });
-            return events;
-        });
-
-    const results = await Promise.all(eventPromises);
-    results.forEach(events => allEvents.push(...events));
+    const allEvents = await loadEventsForWindow(startDate, endDate);
     
     debug(`Total events fetched for working days: ${allEvents.length}`);
     
@@ -906,22 +1173,7 @@ async function renderWeek() {
     const startDate = formatDate(weekDays[0]);
     const endDate = formatDate(new Date(weekDays[6].getTime() + 24*60*60*1000));
     
-    const allEvents = [];
-    
-    // Fetch events in parallel for better performance
-    const eventPromises = calendars
-        .filter(calendar => activeFilters.has(calendar))
-        .map(async calendar => {
-            const events = await getEvents(calendar, startDate, endDate);
-            events.forEach(event => {
-                event.calendar = calendar;
-                event.color = colors[calendar] || '#2196F3';
-            });
-            return events;
-        });
-
-    const results = await Promise.all(eventPromises);
-    results.forEach(events => allEvents.push(...events));
+    const allEvents = await loadEventsForWindow(startDate, endDate);
     
     debug(`Total events fetched: ${allEvents.length}`);
     
@@ -1157,6 +1409,7 @@ window.deleteSelectedEvent = async function() {
             headers['Authorization'] = `Bearer ${token}`;
         }
         
+        const startedAt = performance.now();
         const response = await fetch(API_ENDPOINTS.DELETE_EVENT, {
             method: 'POST',
             headers,
@@ -1167,6 +1420,7 @@ window.deleteSelectedEvent = async function() {
                 event_id: selectedEventId,
             }),
         });
+        debugTiming('Delete event', response, startedAt);
         
         if (!response.ok) {
             const errorText = await response.text();
@@ -1477,11 +1731,13 @@ window.submitEvent = async function(event) {
         if (isEditing) {
             // Update existing event
             serviceData.event_uid = editingEvent.uid;
+            const startedAt = performance.now();
             const response = await fetch(API_ENDPOINTS.UPDATE_EVENT, {
                 method: 'POST',
                 headers,
                 body: JSON.stringify(serviceData),
             });
+            debugTiming('Update event', response, startedAt);
             
             if (!response.ok) {
                 const errorData = await response.json();
@@ -1492,11 +1748,13 @@ window.submitEvent = async function(event) {
             showToast(t('eventUpdatedSuccess'), 'success');
         } else {
             // Create new event
+            const startedAt = performance.now();
             const response = await fetch(API_ENDPOINTS.ADD_EVENT, {
                 method: 'POST',
                 headers,
                 body: JSON.stringify(serviceData),
             });
+            debugTiming('Add event', response, startedAt);
             
             if (!response.ok) {
                 const errorData = await response.json();
@@ -1537,8 +1795,15 @@ if (document.readyState === 'loading') {
     init();
 }
 
-// Auto-refresh every 1 minute (60000 ms)
+// Auto-refresh every 1 minute (60000 ms). While events are pushed over the websocket
+// only refresh every 15 minutes to pick up config, weather and date changes.
+const LIVE_REFRESH_INTERVAL = 15 * 60000;
+let lastAutoRefresh = Date.now();
 setInterval(() => {
+    if (liveSubscription && liveSubscription.ready && Date.now() - lastAutoRefresh < LIVE_REFRESH_INTERVAL) {
+        return;
+    }
+    lastAutoRefresh = Date.now();
     debug('Auto-refresh: fetching latest config and events');
     init();
 }, 60000);